@@ -0,0 +1,97 @@
+"""Benchmark LMStudioConnector against a local stub of the LM Studio API.
+
+Compares the old behaviour (module-level `requests.post`, one TCP connection
+per prompt) with the pooled keep-alive session owned by the connector.
+
+Usage:
+    python benchmarks/bench_connector.py [--requests 2000] [--threads 10]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_gen import LMStudioConnector
+
+RESPONSE = json.dumps({
+    "choices": [{"message": {"role": "assistant", "content": "Review Request"}}]
+}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like LM Studio
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server():
+    """Start the stub server on a free port and return it."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def unpooled_answer(port: int, message: str) -> str:
+    """Reproduce the previous connector: a fresh connection per prompt."""
+    data = {
+        "messages": [{"role": "user", "content": message}],
+        "temperature": 0.7,
+        "max_tokens": -1,
+        "stream": False
+    }
+    response = requests.post(
+        f"http://127.0.0.1:{port}/v1/chat/completions",
+        headers={"Content-Type": "application/json"},
+        data=json.dumps(data)
+    )
+    return response.json()["choices"][0]["message"]["content"]
+
+
+def run(label: str, call, num_requests: int, num_threads: int) -> float:
+    """Issue `num_requests` calls from `num_threads` threads and report req/s."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        list(executor.map(call, (f"prompt {i}" for i in range(num_requests))))
+    elapsed = time.perf_counter() - start
+    rate = num_requests / elapsed
+    print(f"{label:<10} {num_requests} requests in {elapsed:.2f}s -> {rate:,.0f} req/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=10)
+    args = parser.parse_args()
+
+    server = start_stub_server()
+    port = server.server_address[1]
+
+    before = run('before', lambda m: unpooled_answer(port, m), args.requests, args.threads)
+    with LMStudioConnector(ip='127.0.0.1', port=port, pool_size=args.threads) as connector:
+        after = run('after', connector.get_answer, args.requests, args.threads)
+
+    print(f"speedup    {after / before:.2f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark the python and numpy engines of ProcessDataGenerator.
+
+Generates the same number of cases over one random process graph with each
+engine and reports events per second. A small warm-up run of each engine
+comes first, so the timings exclude the imports deferred to generate_data.
+
+Usage:
+    python benchmarks/bench_data_engines.py [--cases 250000] [--skip-python]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_gen import ProcessGenerator, ProcessDataGenerator
+
+
+def run(label: str, generator: ProcessDataGenerator) -> float:
+    """Generate the event log once and report events/s."""
+    start = time.perf_counter()
+    df = generator.generate_data()
+    elapsed = time.perf_counter() - start
+    rate = len(df) / elapsed
+    print(f"{label:<7} {len(df):,} events in {elapsed:.2f}s -> {rate:,.0f} events/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', type=int, default=250000)
+    parser.add_argument('--skip-python', action='store_true', help="Only run the numpy engine")
+    args = parser.parse_args()
+
+    graph = ProcessGenerator(min_nodes=8, max_nodes=10, seed=0).generate_process()
+
+    # Warm up, so the first timed run does not pay the lazy pandas and tqdm imports
+    for engine in ('numpy', 'python'):
+        ProcessDataGenerator(graph, num_cases=10, engine=engine, seed=0).generate_data()
+
+    numpy_rate = run('numpy', ProcessDataGenerator(graph, num_cases=args.cases, engine="numpy", seed=0))
+    if not args.skip_python:
+        python_rate = run('python', ProcessDataGenerator(graph, num_cases=args.cases))
+        print(f"speedup {numpy_rate / python_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
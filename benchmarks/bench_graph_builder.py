@@ -0,0 +1,40 @@
+"""Benchmark the structure builder of ProcessGenerator on very large graphs.
+
+Builds unnamed process graphs with a fixed number of nodes and reports nodes
+and edges per second. No LLM is involved.
+
+Usage:
+    python benchmarks/bench_graph_builder.py [--nodes 100000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_gen import ProcessGenerator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodes', type=int, default=100000)
+    parser.add_argument('--max-connections', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    generator = ProcessGenerator(min_nodes=args.nodes, max_nodes=args.nodes,
+                                 max_connections=args.max_connections, seed=0)
+
+    start = time.perf_counter()
+    edges = 0
+    for _ in range(args.repeat):
+        generator._generate_structure()
+        edges += generator.process_graph.num_edges
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.repeat} graphs of {args.nodes:,} nodes ({edges / args.repeat:,.0f} edges) "
+          f"in {elapsed:.2f}s -> {args.nodes * args.repeat / elapsed:,.0f} nodes/s, {edges / elapsed:,.0f} edges/s")
+
+
+if __name__ == "__main__":
+    main()
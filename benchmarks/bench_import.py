@@ -0,0 +1,110 @@
+"""Benchmark the import time of the data_gen package.
+
+Every scenario runs in fresh interpreters, as a process-pool worker would pay
+it at spawn, and reports the median wall time of the import. The script exits
+with an error when a scenario loads a dependency it should not need, when
+--max-ms is given and a scenario is slower than that, or when a package
+attribute resolves to a submodule instead of its class.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5] [--max-ms 500]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['pandas', 'numpy', 'tqdm', 'requests', 'httpx', 'networkx', 'matplotlib', 'pyarrow']
+
+# Statement to time and the heavy modules it must not load
+SCENARIOS = [
+    ('import data_gen', HEAVY_MODULES),
+    ('from data_gen import ProcessGenerator', ['pandas', 'tqdm', 'requests', 'httpx', 'networkx', 'matplotlib', 'pyarrow']),
+    ('from data_gen import LMStudioConnector', ['pandas', 'numpy', 'tqdm', 'httpx', 'networkx', 'matplotlib', 'pyarrow']),
+    ('from data_gen import ProcessDataGenerator', ['pandas', 'tqdm', 'requests', 'httpx', 'networkx', 'matplotlib', 'pyarrow']),
+]
+
+# Imports after which `from data_gen import X` must still give the class, as
+# unpickling in a spawned pool worker or a direct submodule import does
+RESOLUTION_CHECKS = [
+    ('import data_gen.ResponseCache', ['ResponseCache']),
+    ('from data_gen.ProcessDataGenerator import ProcessDataGenerator', ['ProcessDataGenerator', 'BusinessCalendar', 'XESWriter']),
+    ('import pickle; from data_gen.ProcessGraph import ProcessGraph; '
+     'pickle.loads(pickle.dumps(ProcessGraph.from_dict({"a": []})))', ['ProcessGraph']),
+    ('from data_gen.ProcessGenerator import _generate_shard', ['ProcessGenerator', 'ProcessGraph', 'CircuitOpenError']),
+]
+
+RESOLUTION_PROBE = """
+import inspect
+{statement}
+from data_gen import {names}
+print(' '.join(name for name in {names_list!r} if not inspect.isclass(globals()[name])))
+"""
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str, repeat: int):
+    """Run `statement` in `repeat` fresh interpreters, return the times and the heavy modules loaded."""
+    times, loaded = [], set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+            cwd=ROOT, check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        times.append(result['ms'])
+        loaded.update(result['loaded'])
+    return times, loaded
+
+
+def check_resolution(statement: str, names):
+    """Run `statement` in a fresh interpreter, return the names that do not resolve to a class."""
+    output = subprocess.run(
+        [sys.executable, '-c', RESOLUTION_PROBE.format(statement=statement, names=', '.join(names), names_list=names)],
+        cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return output.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=None, help="Fail when a scenario is slower than this")
+    args = parser.parse_args()
+
+    failures = []
+    for statement, forbidden in SCENARIOS:
+        times, loaded = measure(statement, args.repeat)
+        median = statistics.median(times)
+        print(f"{statement:<45} {median:7.1f} ms  loads: {', '.join(sorted(loaded)) or '-'}")
+
+        unexpected = sorted(loaded & set(forbidden))
+        if unexpected:
+            failures.append(f"{statement} loads {', '.join(unexpected)}")
+        if args.max_ms is not None and median > args.max_ms:
+            failures.append(f"{statement} takes {median:.1f} ms (max {args.max_ms:.0f} ms)")
+
+    for statement, names in RESOLUTION_CHECKS:
+        unresolved = check_resolution(statement, names)
+        print(f"{statement[:45]:<45} {'ok' if not unresolved else 'modules: ' + ', '.join(unresolved)}")
+        if unresolved:
+            failures.append(f"after {statement}, {', '.join(unresolved)} resolve to submodules")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Benchmark the AdaptiveLimiter against local stubs of the LM Studio API.
+
+Every scenario runs once without and once with the limiter:
+
+- queueing: the server answers 4 requests at a time and queues the rest, the
+  limit must settle near those 4 slots instead of the number of threads;
+- noisy: unlimited capacity with replies between 50 and 400 ms, the variance
+  of the answers must not be taken for queueing;
+- fast: unlimited capacity with 10 ms replies;
+- tokens: unlimited capacity, answers of 3 to 300 tokens reported in `usage`.
+
+The script exits with an error when the limiter makes a scenario much slower
+than running without it, or when it does not settle near the capacity of the
+queueing server.
+
+Usage:
+    python benchmarks/bench_limiter.py [--scale 1.0]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Semaphore, Thread
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_gen import AdaptiveLimiter, LMStudioConnector
+
+SLOTS = 4
+
+
+def start_stub_server(service_time, slots=None):
+    """Start a stub server whose replies take `service_time()` seconds, and
+    `slots` requests at a time at most. Returns the server."""
+    gpu = Semaphore(slots) if slots else None
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            delay, tokens = service_time()
+            if gpu:
+                with gpu:
+                    time.sleep(delay)
+            else:
+                time.sleep(delay)
+            body = {"choices": [{"message": {"role": "assistant", "content": "Review Request"}}]}
+            if tokens:
+                body["usage"] = {"completion_tokens": tokens}
+            response = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 256
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(port, num_threads, num_requests, limiter):
+    """Send `num_requests` prompts from `num_threads` threads. Returns the elapsed
+    seconds and the limits sampled over the second half of the run."""
+    connector = LMStudioConnector(port=port, pool_size=num_threads, limiter=limiter, coalesce=False)
+    limits, done = [], [0]
+
+    def call(i):
+        connector.get_answer(f"prompt {i}", use_cache=False)
+        done[0] += 1
+        if limiter and done[0] > num_requests // 2:
+            limits.append(limiter.limit)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        list(executor.map(call, range(num_requests)))
+    connector.close()
+    return time.perf_counter() - start, limits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiplier of the number of requests")
+    args = parser.parse_args()
+
+    def tokens_service_time():
+        tokens = random.randint(3, 300)
+        return 0.01 + tokens * 0.001, tokens
+
+    # name, service time, server slots, threads, requests, max slowdown with the limiter
+    scenarios = [
+        ('queueing', lambda: (0.05, None), SLOTS, 48, 1200, 1.2),
+        ('noisy', lambda: (random.uniform(0.05, 0.4), None), None, 10, 200, 1.3),
+        ('fast', lambda: (0.01, None), None, 32, 1000, 1.3),
+        ('tokens', tokens_service_time, None, 16, 600, 1.3),
+    ]
+
+    failures = []
+    for name, service_time, slots, num_threads, num_requests, max_slowdown in scenarios:
+        num_requests = max(num_threads, int(num_requests * args.scale))
+        server = start_stub_server(service_time, slots)
+        port = server.server_address[1]
+
+        baseline, _ = run(port, num_threads, num_requests, None)
+        limiter = AdaptiveLimiter(max_limit=num_threads)
+        elapsed, limits = run(port, num_threads, num_requests, limiter)
+        server.shutdown()
+
+        limit = statistics.median(limits)
+        stats = limiter.stats()
+        print(f"{name:<9} no limiter {baseline:6.2f}s  limiter {elapsed:6.2f}s  "
+              f"limit {limit:4.1f} (max {num_threads})  decreases {stats['decreases']}")
+
+        if elapsed > max_slowdown * baseline:
+            failures.append(f"{name}: {elapsed:.2f}s with the limiter, {baseline:.2f}s without")
+        if slots and not slots <= limit <= 2.5 * slots:
+            failures.append(f"{name}: limit {limit:.1f} does not settle near the {slots} server slots")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Union
+
+class AdaptiveLimiter:
+    # Throughput gain over the baseline window that makes a window the new baseline
+    BASELINE_GAIN = 1.25
+
+    def __init__(self, initial_limit: int = 4, min_limit: int = 1, max_limit: int = 64,
+                 latency_tolerance: float = 1.5, backoff: float = 0.8, window: int = 50):
+        """
+        Adaptive cap on the number of requests in flight to the LLM server.
+
+        The limit doubles per round trip until the first overload (slow start),
+        then grows by one per round trip while the server keeps up, and is
+        multiplied by `backoff` on failures or when the latency rises above the
+        baseline measured at the best throughput (AIMD). Callers over the limit
+        wait in FIFO order, so one instance can be shared by threads, asyncio
+        tasks and connectors.
+
+        Args:
+            initial_limit: Requests allowed in flight before any feedback
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            latency_tolerance: Ratio of the average latency over the baseline treated as queueing
+            backoff: Factor applied to the limit on overload
+            window: Requests averaged by the latency averages
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters: Deque[Union[threading.Event, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+        self.window = max(1, window)
+        # Moving average of the latency over about `window` requests
+        self._latency: Optional[float] = None
+        # Average latency and throughput of the best window, and the limit it was measured at
+        self._baseline: Optional[float] = None
+        self._baseline_throughput = 0.0
+        self._baseline_limit = 0
+        self._slow_start = True
+        self._window_sum = 0.0
+        self._window_started: Optional[float] = None
+        self._window_count = 0
+        self._window_limit = 0  # Highest limit during the current window
+        self._last_decrease = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers waiting for a slot."""
+        return len(self._waiters)
+
+    def _try_acquire(self) -> bool:
+        """Take a slot if one is free and nobody is queued before us. Called with the lock held."""
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return True
+        return False
+
+    def acquire(self):
+        """Block the calling thread until a slot is free."""
+        with self._lock:
+            if self._try_acquire():
+                return
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+        # The slot is handed over by _grant_waiters before the event is set
+        waiter.wait()
+
+    async def acquire_async(self):
+        """Wait on the event loop until a slot is free."""
+        with self._lock:
+            if self._try_acquire():
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    granted = False
+                except ValueError:
+                    granted = True
+            if granted:
+                # The slot was handed over just before the cancellation, give it back
+                self.release()
+            raise
+
+    def release(self, latency: Optional[float] = None, success: bool = True, tokens: Optional[int] = None):
+        """Free a slot and feed the outcome of the request back into the limit.
+
+        Args:
+            latency: Seconds the request took, None when there is nothing to learn from it
+            success: False when the request failed because of the server (timeout,
+                connection error, 429 or 5xx)
+            tokens: Completion tokens of the answer, when the server reports them
+        """
+        with self._lock:
+            saturated = bool(self._waiters) or self._in_flight >= self.limit
+            self._in_flight -= 1
+
+            if not success:
+                # Timeout, connection error, 429 or 5xx
+                self.failures += 1
+                self._decrease(latency)
+            elif latency is not None:
+                self.successes += 1
+                # Per token when the server reports usage, so long answers do not read as queueing
+                baseline = self._observe_latency(latency / tokens if tokens else latency)
+                if baseline is None:
+                    pass  # Still measuring the first baseline
+                elif self._latency > self.latency_tolerance * baseline:
+                    # The moving average, not single latencies, which mostly reflect the answer length
+                    self._decrease(latency)
+                elif saturated:
+                    # One slot per request in slow start, then one per round trip, while the limit is in use
+                    self._limit = min(self.max_limit, self._limit + (1 if self._slow_start else 1 / self._limit))
+
+            self._grant_waiters()
+
+    def _observe_latency(self, latency: float) -> Optional[float]:
+        """Record a latency sample and return the baseline. Called with the lock held."""
+        now = time.monotonic()
+        if self._window_started is None:
+            self._window_started = now
+        if self._baseline is not None:
+            # Clip outliers (a dropped connection, a retransmitted SYN), one of them would
+            # otherwise lift the moving average past the tolerance on its own
+            latency = min(latency, 2 * self.latency_tolerance * self._baseline)
+        self._latency = latency if self._latency is None else self._latency + (latency - self._latency) * 2 / (self.window + 1)
+        self._window_sum += latency
+        self._window_count += 1
+        self._window_limit = max(self._window_limit, self.limit)
+
+        # The limit stays at initial_limit for a first, shorter window that measures the
+        # baseline. A later window replaces it when its throughput (requests completed per
+        # second) is clearly higher, so latency that grows along with the throughput is
+        # not taken for queueing, while a queue, which adds latency and no throughput, is. A window at no higher limit also replaces it, so a server that
+        # really became slower is re-measured once the limit backs off
+        if self._window_count >= (self.window if self._baseline is not None else max(1, self.window // 5)):
+            average = self._window_sum / self._window_count
+            # The first window is timed from its first completion, which it does not count
+            completions = self._window_count - (self._baseline is None)
+            throughput = completions / max(now - self._window_started, 1e-9)
+            if self._baseline is None:
+                # Start the moving average from a whole window rather than its first sample
+                self._latency = average
+            if (self._baseline is None or throughput > self.BASELINE_GAIN * self._baseline_throughput
+                    or self._window_limit <= self._baseline_limit):
+                self._baseline, self._baseline_throughput, self._baseline_limit = average, throughput, self._window_limit
+            self._window_sum, self._window_count, self._window_limit, self._window_started = 0.0, 0, 0, now
+        return self._baseline
+
+    def _decrease(self, latency: Optional[float]):
+        """Multiplicative decrease, once per round trip. Called with the lock held."""
+        now = time.monotonic()
+        if now - self._last_decrease < (latency or 0.0):
+            return
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        self._slow_start = False
+        self._last_decrease = now
+        self.decreases += 1
+
+    def _grant_waiters(self):
+        """Hand free slots to the queued callers in FIFO order. Called with the lock held."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            self._in_flight += 1
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                waiter.get_loop().call_soon_threadsafe(self._wake, waiter)
+
+    @staticmethod
+    def _wake(waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def _queue_estimate(self) -> Optional[float]:
+        """Requests waiting on the server, estimated as limit * (1 - baseline / latency). Called with the lock held."""
+        if self._baseline is None or not self._latency:
+            return None
+        return max(0.0, self._limit * (1 - self._baseline / self._latency))
+
+    def stats(self) -> Dict:
+        """Return the current limit, requests in flight, queue depth and outcome counters."""
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'in_flight': self._in_flight,
+                'queue_depth': len(self._waiters),
+                'latency': self._latency,
+                'baseline_latency': self._baseline,
+                'queue_estimate': self._queue_estimate(),
+                'successes': self.successes,
+                'failures': self.failures,
+                'decreases': self.decreases
+            }
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import requests
+from functools import partial
+from typing import Dict, List, Optional, TYPE_CHECKING
+from .AdaptiveLimiter import AdaptiveLimiter
+from .CircuitBreaker import CircuitBreaker
+from .LMStudioConnector import LMStudioConnector, _BlockingIO
+from .ResponseCache import ResponseCache
+from .RetryPolicy import RetryPolicy
+
+if TYPE_CHECKING:
+    import httpx
+
+class AsyncLMStudioConnector(LMStudioConnector):
+    def __init__(
+        self,
+        ip: str = 'localhost',
+        port: int = 1234,
+        max_concurrency: int = 64,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 300.0,
+        model: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = True,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        """Initialize the asyncio-native LM Studio connector.
+
+        Prompts are sent with `get_answer_async` through a single async HTTP
+        client, and at most `max_concurrency` of them are in flight at once. The
+        synchronous `get_answer` inherited from LMStudioConnector keeps working
+        for code that still runs in threads.
+
+        Args:
+            ip (str): IP address of the LM Studio server. Defaults to 'localhost'.
+            port (int): Port number of the LM Studio server. Defaults to 1234.
+            max_concurrency (int): Maximum number of prompts in flight, which is
+                also the size of the keep-alive connection pool. Defaults to 64.
+            connect_timeout (float): Seconds to wait for a connection to be
+                established. Defaults to 5.0.
+            read_timeout (float): Seconds to wait for the server to answer a
+                prompt. Defaults to 300.0.
+            model (str, optional): Model identifier sent to the server. Defaults to None.
+            cache (ResponseCache, optional): Persistent prompt/response cache. Defaults to None.
+            coalesce (bool): Share one request between concurrent identical prompts. Defaults to True.
+            limiter (AdaptiveLimiter, optional): Adaptive cap on the requests in
+                flight, below max_concurrency. Defaults to None.
+            retry_policy (RetryPolicy, optional): Retries of transient failures. Defaults to RetryPolicy().
+            circuit_breaker (CircuitBreaker, optional): Fails fast while the server is down. Defaults to None.
+        """
+        super().__init__(ip, port, pool_size=max_concurrency, connect_timeout=connect_timeout,
+                         read_timeout=read_timeout, model=model, cache=cache, coalesce=coalesce, limiter=limiter,
+                         retry_policy=retry_policy, circuit_breaker=circuit_breaker)
+        self.max_concurrency = max(1, max_concurrency)
+        self._client: Optional['httpx.AsyncClient'] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight_async: Dict[str, asyncio.Task] = {}
+
+    def _get_client(self) -> 'httpx.AsyncClient':
+        """Create the async client lazily, inside the running event loop."""
+        import httpx
+
+        if self._client is None:
+            connect_timeout, read_timeout = self.timeout
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def aclose(self):
+        """Close the async client and the pooled synchronous session."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def get_answer_async(
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = -1,
+        stream: bool = False,
+        use_cache: bool = True
+    ) -> Dict:
+        """Send a message to LM Studio without blocking the event loop.
+
+        Takes the same arguments as `get_answer`.
+
+        Returns:
+            Dict: The JSON response from LM Studio
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails, after the retries for transient errors
+            CircuitOpenError: If the circuit breaker is open
+        """
+        messages = self._build_messages(message, system_prompt)
+        request_key = self._request_key(messages, temperature, max_tokens, use_cache, stream)
+
+        if self.cache and request_key is not None:
+            # SQLite reads and writes block, keep them off the event loop
+            cached = await _EventLoopIO(self).call(self.cache.get, request_key)
+            if cached is not None:
+                return cached
+
+        if not self.coalesce or request_key is None:
+            return await self._fetch_async(messages, temperature, max_tokens, stream, request_key)
+
+        # Single flight on the event loop: the request runs in its own task and every
+        # identical prompt, the first one included, awaits it shielded, so cancelling
+        # one caller does not cancel the request the others are waiting for
+        task = self._in_flight_async.get(request_key)
+        if task is not None:
+            with self._lock:
+                self.coalesced += 1
+        else:
+            task = self._in_flight_async[request_key] = asyncio.ensure_future(
+                self._fetch_async(messages, temperature, max_tokens, stream, request_key)
+            )
+            task.add_done_callback(partial(self._forget_in_flight, request_key))
+        return await asyncio.shield(task)
+
+    def _forget_in_flight(self, request_key: str, task: asyncio.Task):
+        """Drop a finished request from the single flight table."""
+        if self._in_flight_async.get(request_key) is task:
+            del self._in_flight_async[request_key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here, so an error nobody awaited is not logged
+
+    async def _post_async(self, payload: Dict) -> 'httpx.Response':
+        """Post a chat completions request through the async client, at most
+        `max_concurrency` at a time."""
+        import httpx
+
+        client = self._get_client()
+        try:
+            async with self._semaphore:
+                return await client.post(self.base_url, content=json.dumps(payload))
+        except httpx.HTTPError as e:
+            # Surface the same exception type as the synchronous connector
+            raise requests.exceptions.RequestException(str(e)) from e
+
+    async def _fetch_async(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int, stream: bool,
+                           request_key: Optional[str]) -> str:
+        """Send the request through the async client, retrying transient failures,
+        and store the answer in the cache."""
+        return await self._fetch_with(_EventLoopIO(self), messages, temperature, max_tokens, stream, request_key)
+
+class _EventLoopIO(_BlockingIO):
+    """Awaiting counterpart of _BlockingIO: the async client, asyncio.sleep, and
+    cache calls in a worker thread, so the event loop never blocks."""
+
+    async def post(self, payload: Dict) -> 'httpx.Response':
+        return await self.connector._post_async(payload)
+
+    async def acquire(self):
+        await self.connector.limiter.acquire_async()
+
+    async def sleep(self, delay: float):
+        await asyncio.sleep(delay)
+
+    async def call(self, func, *args):
+        # run_in_executor rather than asyncio.to_thread, which needs Python 3.9
+        return await asyncio.get_running_loop().run_in_executor(None, partial(func, *args))
@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Dict
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Circuit breaker for the LLM server.
+
+        After `failure_threshold` consecutive transient failures the circuit
+        opens and requests fail fast with CircuitOpenError for `reset_timeout`
+        seconds. Then a single probe request is let through: its success closes
+        the circuit, its failure opens it again, and a probe that ends without
+        an answer (cancelled, or an error unrelated to the server) is handed to
+        the next caller. Share one instance between the connectors talking to
+        the same server.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    def before_call(self) -> bool:
+        """Check that a request may be sent.
+
+        Returns:
+            bool: True when the request is the half-open probe, which must end with
+                record_success, record_failure or record_aborted
+
+        Raises:
+            CircuitOpenError: While the circuit is open, or while a probe is in flight
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            raise CircuitOpenError(f"LLM server unavailable, retrying in {self.retry_in():.1f}s")
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a probe through (0 when closed)."""
+        if self.state == self.CLOSED:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def record_aborted(self):
+        """Release the probe of a request that ended without an outcome, so the next caller probes."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def stats(self) -> Dict:
+        """Return the state of the circuit and how often it opened and rejected requests."""
+        with self._lock:
+            return {'state': self.state, 'times_opened': self.times_opened, 'rejected': self.rejected}
@@ -0,0 +1,136 @@
+import os
+import shutil
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from typing import Optional
+
+class GraphRenderer:
+    FORMATS = ('png', 'svg')
+
+    def __init__(self, format: Optional[str] = 'png', max_workers: Optional[int] = None, cleanup: bool = True,
+                 cache_dir: Optional[str] = 'cache/renders'):
+        """
+        Background renderer of Graphviz DOT files.
+
+        Generation workers only write DOT sources (`ProcessGenerator.save_dot`)
+        and submit them here; at most `max_workers` `dot` processes run at the
+        same time, so layout never blocks graph or event log generation.
+
+        Args:
+            format: Output format, "png" or "svg". None skips rendering and keeps the DOT files
+            max_workers: Maximum number of concurrent `dot` processes (defaults to the number of cores)
+            cleanup: Remove each DOT file once it has been rendered
+            cache_dir: Directory of rendered images keyed by graph hash and format (None disables it)
+        """
+        if format is not None and format not in self.FORMATS:
+            raise ValueError(f"Unknown format: {format}")
+
+        self.dot_binary = shutil.which('dot') if format else None
+        if format and not self.dot_binary:
+            print("Graphviz is not installed. Please install it to render the process graphs, the DOT files are kept")
+            format = None
+
+        self.format = format
+        self.cleanup = cleanup
+        self.cache_dir = cache_dir
+        if cache_dir and format:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.rendered = 0
+        self.failed = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count(), thread_name_prefix='dot') if format else None
+
+    @staticmethod
+    def link_or_copy(source: str, destination: str):
+        """Hard-link `source` to `destination`, copying when linking is not possible."""
+        if os.path.exists(destination):
+            os.remove(destination)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
+
+    def cached_path(self, key: str) -> str:
+        """Path of the cached image of a graph hash in the renderer's format."""
+        return os.path.join(self.cache_dir, f"{key}.{self.format}")
+
+    def render(self, dot_path: str, key: Optional[str] = None) -> str:
+        """Render one DOT file next to it and return the path of the image.
+
+        With a `key` (see ProcessGraph.structure_hash) an image already in the
+        cache is reused instead of running `dot`, and new images are added to it.
+        Every failure, of `dot` or of the file operations, is counted in `stats()`.
+        """
+        try:
+            return self._render(dot_path, key)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+
+    def _render(self, dot_path: str, key: Optional[str]) -> str:
+        """Body of render, which counts its failures."""
+        output_path = os.path.splitext(dot_path)[0] + '.' + self.format
+        cached_path = self.cached_path(key) if key and self.cache_dir else None
+
+        if cached_path and os.path.exists(cached_path):
+            self.link_or_copy(cached_path, output_path)
+            if self.cleanup:
+                os.remove(dot_path)
+            with self._lock:
+                self.cache_hits += 1
+            return output_path
+
+        # The previous image may be a hard link into the cache, never write through it
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        try:
+            subprocess.run([self.dot_binary, f'-T{self.format}', dot_path, '-o', output_path],
+                           check=True, capture_output=True)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"dot failed on {dot_path}: {e.stderr.decode(errors='replace').strip()}") from e
+
+        if cached_path:
+            # Write under a temporary name so concurrent readers never see a partial image
+            temporary_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            self.link_or_copy(output_path, temporary_path)
+            os.replace(temporary_path, cached_path)
+        if self.cleanup:
+            os.remove(dot_path)
+        with self._lock:
+            self.rendered += 1
+        return output_path
+
+    def submit(self, dot_path: str, key: Optional[str] = None) -> Optional[Future]:
+        """Queue a DOT file for rendering, `key` being its graph hash for the cache.
+        Returns None when rendering is disabled."""
+        if self._executor is None:
+            return None
+        future = self._executor.submit(self.render, dot_path, key)
+        future.add_done_callback(self._report)
+        return future
+
+    @staticmethod
+    def _report(future: Future):
+        if future.exception():
+            print(f"Error rendering graph: {future.exception()}")
+        else:
+            print(f"Graph saved as {future.result()}")
+
+    def stats(self) -> dict:
+        """Return the number of rendered, cached and failed graphs."""
+        with self._lock:
+            return {'rendered': self.rendered, 'cache_hits': self.cache_hits, 'failed': self.failed}
+
+    def close(self):
+        """Wait for the queued graphs to be rendered."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
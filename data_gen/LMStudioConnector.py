@@ -1,17 +1,110 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import time
+from concurrent.futures import Future
+from threading import Lock
 from typing import List, Dict, Union, Optional
+from .AdaptiveLimiter import AdaptiveLimiter
+from .CircuitBreaker import CircuitBreaker
+from .ResponseCache import ResponseCache
+from .RetryPolicy import RetryPolicy
+from ._blocking import run_blocking
 
 class LMStudioConnector:
-    def __init__(self, ip: str = 'localhost', port: int = 1234):
+    def __init__(
+        self,
+        ip: str = 'localhost',
+        port: int = 1234,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 300.0,
+        model: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = True,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         """Initialize the LM Studio connector.
 
+        The connector owns a pooled HTTP session with keep-alive, so a single
+        instance can be shared by several threads and each of them reuses an
+        open connection instead of paying a TCP handshake per prompt.
+
         Args:
             ip (str): IP address of the LM Studio server. Defaults to 'localhost'.
             port (int): Port number of the LM Studio server. Defaults to 1234.
+            pool_size (int): Maximum number of keep-alive connections kept open
+                to the server. Should match the number of threads sharing the
+                connector. Defaults to 10.
+            connect_timeout (float): Seconds to wait for a connection to be
+                established. Defaults to 5.0.
+            read_timeout (float): Seconds to wait for the server to answer a
+                prompt. Defaults to 300.0.
+            model (str, optional): Model identifier sent to the server. Defaults to
+                None, which lets LM Studio use the loaded model.
+            cache (ResponseCache, optional): Persistent prompt/response cache shared
+                by every call. Defaults to None (no caching).
+            coalesce (bool): Share one HTTP call between concurrent identical
+                prompts (single flight). Only applies to calls with use_cache,
+                since the others ask for a fresh answer. Defaults to True.
+            limiter (AdaptiveLimiter, optional): Adaptive cap on the requests in
+                flight, usually shared by every connector talking to the same
+                server. Defaults to None (only pool_size bounds concurrency).
+            retry_policy (RetryPolicy, optional): Retries of connection errors,
+                timeouts, 429 and 5xx responses. Defaults to RetryPolicy().
+            circuit_breaker (CircuitBreaker, optional): Fails fast with
+                CircuitOpenError while the server is down, usually shared by
+                every connector talking to the same server. Defaults to None.
         """
         self.base_url = f"http://{ip}:{port}/v1/chat/completions"
         self.headers = {"Content-Type": "application/json"}
+        self.pool_size = max(1, pool_size)
+        self.timeout = (connect_timeout, read_timeout)
+        self.model = model
+        self.cache = cache
+        self.coalesce = coalesce
+        self.limiter = limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.session = self._create_session()
+
+        # Identical prompts currently being answered, by request key
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = Lock()
+        self.requests_sent = 0
+        self.coalesced = 0
+
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session with a connection pool of `pool_size`."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def close(self):
+        """Close the pooled connections held by the connector."""
+        self.session.close()
+
+    def stats(self) -> Dict:
+        """Return the connector counters: HTTP requests sent, prompts answered by
+        joining an identical request in flight, and cache hits and misses."""
+        with self._lock:
+            counters = {'requests': self.requests_sent, 'coalesced': self.coalesced}
+        counters['cache'] = self.cache.stats() if self.cache else None
+        counters['limiter'] = self.limiter.stats() if self.limiter else None
+        counters['retry'] = self.retry_policy.stats()
+        counters['circuit_breaker'] = self.circuit_breaker.stats() if self.circuit_breaker else None
+        return counters
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def get_answer(
         self,
@@ -19,7 +112,8 @@ class LMStudioConnector:
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = -1,
-        stream: bool = False
+        stream: bool = False,
+        use_cache: bool = True
     ) -> Dict:
         """Send a message to LM Studio and get the response.
 
@@ -29,13 +123,173 @@ class LMStudioConnector:
             temperature (float): Controls randomness in the response. Defaults to 0.7.
             max_tokens (int): Maximum tokens in response. -1 for unlimited. Defaults to -1.
             stream (bool): Whether to stream the response. Defaults to False.
+            use_cache (bool): Whether to read and store the answer in the response
+                cache. Call sites that need a fresh answer every time pass False.
+                Defaults to True.
 
         Returns:
             Dict: The JSON response from LM Studio
 
         Raises:
-            requests.exceptions.RequestException: If the request fails
+            requests.exceptions.RequestException: If the request fails, after the retries for transient errors
+            CircuitOpenError: If the circuit breaker is open
         """
+        messages = self._build_messages(message, system_prompt)
+        request_key = self._request_key(messages, temperature, max_tokens, use_cache, stream)
+
+        if self.cache and request_key is not None:
+            cached = self.cache.get(request_key)
+            if cached is not None:
+                return cached
+
+        if not self.coalesce or request_key is None:
+            return self._fetch(messages, temperature, max_tokens, stream, request_key)
+
+        # Single flight: the first caller sends the request, identical callers wait for it
+        with self._lock:
+            future = self._in_flight.get(request_key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[request_key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            answer = self._fetch(messages, temperature, max_tokens, stream, request_key)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(answer)
+            return answer
+        finally:
+            with self._lock:
+                del self._in_flight[request_key]
+
+    def _request_key(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int,
+                     use_cache: bool, stream: bool) -> Optional[str]:
+        """Key identifying identical requests, or None when the call needs its own answer."""
+        if not use_cache or stream or not (self.cache or self.coalesce):
+            return None
+        return ResponseCache.make_key(messages, temperature, max_tokens, self.model)
+
+    def _fetch(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int, stream: bool,
+               request_key: Optional[str]) -> str:
+        """Send the request to the server, retrying transient failures, and store the answer in the cache."""
+        return run_blocking(self._fetch_with(_BlockingIO(self), messages, temperature, max_tokens, stream, request_key))
+
+    async def _fetch_with(self, io: '_BlockingIO', messages: List[Dict[str, str]], temperature: float, max_tokens: int,
+                          stream: bool, request_key: Optional[str]) -> str:
+        """Retry, circuit breaker and cache logic shared by the synchronous and async
+        connectors; `io` blocks or awaits the transport, waits and cache writes."""
+        payload = self._build_payload(messages, temperature, max_tokens, stream)
+        attempt = 1
+        while True:
+            probe = self._check_circuit()
+            with self._lock:
+                self.requests_sent += 1
+            response = None
+            try:
+                response = await self._send_with(io, payload)
+                if not self._server_overloaded(response.status_code):
+                    break
+                error = self._status_error(response)
+            except requests.exceptions.RequestException as e:
+                error = e
+            except BaseException:
+                self._abort_probe(probe)
+                raise
+            await io.sleep(self._retry_delay(attempt, error, response))
+            attempt += 1
+
+        self._record_success()
+        answer = self._extract_answer(response)
+        if self.cache and request_key is not None:
+            await io.call(self.cache.put, request_key, answer)
+        return answer
+
+    def _check_circuit(self) -> bool:
+        """Fail fast with CircuitOpenError while the circuit breaker is open.
+        Returns whether the request is the probe of a half-open circuit."""
+        if self.circuit_breaker is not None:
+            return self.circuit_breaker.before_call()
+        return False
+
+    def _abort_probe(self, probe: bool):
+        """Release the half-open probe of a request interrupted before any answer
+        (cancellation, KeyboardInterrupt or an error unrelated to the server)."""
+        if probe:
+            self.circuit_breaker.record_aborted()
+
+    def _record_success(self):
+        """Report to the circuit breaker that the server answered."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+
+    def _retry_delay(self, attempt: int, error: Exception, response=None) -> float:
+        """Record a transient failure and return the wait before the next attempt.
+
+        Raises:
+            error: When the retry policy has no attempts left
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+
+        retry_after = None
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                pass
+
+        delay = self.retry_policy.next_delay(attempt, retry_after)
+        if delay is None:
+            raise error
+        return delay
+
+    async def _send_with(self, io: '_BlockingIO', payload: Dict):
+        """Post a request through `io`, holding a limiter slot and feeding its outcome
+        back into the limiter if there is one."""
+        if self.limiter is None:
+            return await io.post(payload)
+
+        await io.acquire()
+        latency, success, tokens = None, True, None
+        start = time.monotonic()
+        try:
+            response = await io.post(payload)
+            latency, success = time.monotonic() - start, not self._server_overloaded(response.status_code)
+            tokens = self._completion_tokens(response)
+            return response
+        except requests.exceptions.RequestException:
+            latency, success = time.monotonic() - start, False
+            raise
+        finally:
+            self.limiter.release(latency, success, tokens)
+
+    def _post(self, payload: Dict) -> requests.Response:
+        """Transport of a single request to the server."""
+        return self.session.post(self.base_url, data=json.dumps(payload), timeout=self.timeout)
+
+    @staticmethod
+    def _completion_tokens(response) -> Optional[int]:
+        """Completion tokens reported in the usage of a successful response, if any."""
+        if response.status_code != 200:
+            return None
+        try:
+            return int(response.json()["usage"]["completion_tokens"]) or None
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _server_overloaded(status_code: int) -> bool:
+        """Whether a status code means the server could not keep up (429 or 5xx)."""
+        return status_code == 429 or status_code >= 500
+
+    def _build_messages(self, message: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        """Build the chat messages for a prompt."""
         messages: List[Dict[str, str]] = []
 
         if system_prompt:
@@ -49,23 +303,56 @@ class LMStudioConnector:
             "content": message
         })
 
+        return messages
+
+    def _build_payload(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int, stream: bool) -> Dict:
+        """Build the request body of the chat completions endpoint."""
         data = {
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
             "stream": stream
         }
+        if self.model:
+            data["model"] = self.model
+        return data
 
-        response = requests.post(
-            self.base_url,
-            headers=self.headers,
-            data=json.dumps(data)
-        )
+    @staticmethod
+    def _extract_answer(response) -> str:
+        """Return the content of the last message of a chat completions response.
 
+        Raises:
+            requests.exceptions.RequestException: If the server answered with an error
+        """
         if response.status_code == 200:
             # Return only the content of the last message
             return response.json()["choices"][0]["message"]["content"]
         else:
-            raise requests.exceptions.RequestException(
-                f"Request failed with status {response.status_code}: {response.text}"
-            )
\ No newline at end of file
+            raise LMStudioConnector._status_error(response)
+
+    @staticmethod
+    def _status_error(response) -> requests.exceptions.RequestException:
+        """Exception describing an error response of the server."""
+        return requests.exceptions.RequestException(
+            f"Request failed with status {response.status_code}: {response.text}"
+        )
+
+
+class _BlockingIO:
+    """Blocking transport, waits and cache calls of the shared connector logic,
+    for the synchronous API run through run_blocking."""
+
+    def __init__(self, connector: LMStudioConnector):
+        self.connector = connector
+
+    async def post(self, payload: Dict) -> requests.Response:
+        return self.connector._post(payload)
+
+    async def acquire(self):
+        self.connector.limiter.acquire()
+
+    async def sleep(self, delay: float):
+        time.sleep(delay)
+
+    async def call(self, func, *args):
+        return func(*args)
@@ -0,0 +1,233 @@
+import json
+import random
+import statistics
+import time
+from threading import Lock, Thread
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .AdaptiveLimiter import AdaptiveLimiter
+from .CircuitBreaker import CircuitBreaker
+from .LMStudioConnector import LMStudioConnector
+from .ResponseCache import ResponseCache
+from .RetryPolicy import RetryPolicy
+
+class _Endpoint:
+    """Load and health of one inference server of an LMStudioPool."""
+
+    def __init__(self, address: str):
+        if not address.startswith(('http://', 'https://')):
+            address = 'http://' + address
+        self.url = address.rstrip('/') if '/v1/' in address else address.rstrip('/') + '/v1/chat/completions'
+        self.models_url = self.url.rsplit('/chat/completions', 1)[0] + '/models'
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency: Optional[float] = None  # EWMA of successful requests, seconds
+        self.samples = 0
+        self.ejected = False
+        self.ejected_until = 0.0  # When an ejected endpoint is due for a health check
+        self.probing = False
+        self.ejections = 0
+
+    @property
+    def healthy(self) -> bool:
+        return not self.ejected
+
+    def due_for_probe(self, now: float) -> bool:
+        return self.ejected and not self.probing and now >= self.ejected_until
+
+class LMStudioPool(LMStudioConnector):
+    def __init__(
+        self,
+        endpoints: List[str],
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 300.0,
+        model: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = True,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        slow_factor: float = 3.0
+    ):
+        """Initialize a connector that spreads prompts over several LLM servers.
+
+        Each request goes to the less loaded of two endpoints picked at random
+        (power of two choices on outstanding requests), which keeps the load
+        even without global coordination. An endpoint that fails `eject_after`
+        times in a row, or whose latency grows beyond `slow_factor` times the
+        median of the others, is ejected for `eject_seconds`; then a background
+        health check (GET /v1/models) puts it back, or ejects it again, before
+        any prompt reaches it. Caching, coalescing, retries and the circuit breaker work
+        as in LMStudioConnector, on top of the pool; a retry usually lands on
+        another endpoint.
+
+        Args:
+            endpoints (List[str]): Servers as "host:port" or base URLs, e.g.
+                ["localhost:1234", "http://10.0.0.2:8080"].
+            pool_size (int): Keep-alive connections kept open to each endpoint. Defaults to 10.
+            connect_timeout (float): Seconds to wait for a connection to be established. Defaults to 5.0.
+            read_timeout (float): Seconds to wait for a server to answer a prompt. Defaults to 300.0.
+            model (str, optional): Model identifier sent to the servers. Defaults to None.
+            cache (ResponseCache, optional): Persistent prompt/response cache. Defaults to None.
+            coalesce (bool): Share one request between concurrent identical prompts. Defaults to True.
+            limiter (AdaptiveLimiter, optional): Adaptive cap on the requests in flight
+                over the whole pool. Defaults to None.
+            retry_policy (RetryPolicy, optional): Retries of transient failures. Defaults to RetryPolicy().
+            circuit_breaker (CircuitBreaker, optional): Fails fast while every server is down. Defaults to None.
+            eject_after (int): Consecutive failures that eject an endpoint. Defaults to 3.
+            eject_seconds (float): Seconds before an ejected endpoint is health checked. Defaults to 30.0.
+            slow_factor (float): Latency ratio over the median of the other endpoints
+                that ejects an endpoint. Defaults to 3.0.
+        """
+        if not endpoints:
+            raise ValueError("LMStudioPool needs at least one endpoint")
+        self.endpoints = [_Endpoint(address) for address in endpoints]
+        self.eject_after = max(1, eject_after)
+        self.eject_seconds = eject_seconds
+        self.slow_factor = slow_factor
+        self._pool_lock = Lock()
+        super().__init__(pool_size=pool_size, connect_timeout=connect_timeout, read_timeout=read_timeout,
+                         model=model, cache=cache, coalesce=coalesce, limiter=limiter,
+                         retry_policy=retry_policy, circuit_breaker=circuit_breaker)
+        self.base_url = self.endpoints[0].url
+
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session with a pool of `pool_size` connections per endpoint."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.endpoints), pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def _choose_endpoint(self) -> Optional[_Endpoint]:
+        """Pick the less loaded of two random healthy endpoints, or None when every
+        endpoint is ejected. Called with the pool lock held."""
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.healthy]
+        if not healthy:
+            return None
+        if len(healthy) == 1:
+            return healthy[0]
+        first, second = random.sample(healthy, 2)
+        return min(first, second, key=lambda endpoint: (endpoint.outstanding, endpoint.latency or 0.0))
+
+    def _due_probes(self) -> List[_Endpoint]:
+        """Claim the health checks of the ejected endpoints whose `eject_seconds` are over.
+        Called with the pool lock held."""
+        now = time.monotonic()
+        due = [endpoint for endpoint in self.endpoints if endpoint.due_for_probe(now)]
+        for endpoint in due:
+            endpoint.probing = True
+        return due
+
+    def _eject(self, endpoint: _Endpoint, reason: str):
+        """Stop sending traffic to an endpoint until a health check passes, at the
+        earliest in `eject_seconds`. Called with the pool lock held."""
+        endpoint.ejected = True
+        endpoint.ejected_until = time.monotonic() + self.eject_seconds
+        endpoint.ejections += 1
+        endpoint.consecutive_failures = 0
+        endpoint.latency, endpoint.samples = None, 0
+        print(f"Ejecting LLM endpoint {endpoint.url}, health check in {self.eject_seconds:g}s: {reason}")
+
+    def _record(self, endpoint: _Endpoint, latency: float, success: bool):
+        """Update the load and health of an endpoint after a request."""
+        with self._pool_lock:
+            endpoint.outstanding -= 1
+            if not success:
+                endpoint.failures += 1
+            if not endpoint.healthy:
+                # Requests sent before the ejection, the endpoint is already out
+                return
+            if not success:
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.eject_after:
+                    self._eject(endpoint, f"{endpoint.consecutive_failures} consecutive failures")
+                return
+
+            endpoint.consecutive_failures = 0
+            endpoint.latency = latency if endpoint.latency is None else 0.8 * endpoint.latency + 0.2 * latency
+            endpoint.samples += 1
+
+            # Eject outliers; the others must be healthy, so the last healthy endpoint stays
+            others = [e.latency for e in self.endpoints
+                      if e is not endpoint and e.healthy and e.latency is not None and e.samples >= 10]
+            if endpoint.samples >= 10 and others and endpoint.latency > self.slow_factor * statistics.median(others):
+                self._eject(endpoint, f"latency {endpoint.latency:.2f}s, others {statistics.median(others):.2f}s")
+
+    def _post(self, payload: Dict) -> requests.Response:
+        """Send a request to the endpoint chosen by power of two choices."""
+        with self._pool_lock:
+            due = self._due_probes()
+            endpoint = self._choose_endpoint()
+        if endpoint is None:
+            # Every endpoint is ejected: health check the due ones before giving up
+            for candidate in due:
+                self._probe(candidate)
+            due = []
+        for candidate in due:
+            Thread(target=self._probe, args=(candidate,), daemon=True).start()
+
+        with self._pool_lock:
+            endpoint = endpoint or self._choose_endpoint()
+            if endpoint is None:
+                # Counts as a failed attempt, so the retries wait for the next health checks
+                raise requests.exceptions.ConnectionError("No healthy LLM endpoint")
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+
+        start = time.monotonic()
+        success = False
+        try:
+            response = self.session.post(endpoint.url, data=json.dumps(payload), timeout=self.timeout)
+            success = not self._server_overloaded(response.status_code)
+            return response
+        finally:
+            self._record(endpoint, time.monotonic() - start, success)
+
+    def _probe(self, endpoint: _Endpoint, timeout: float = 2.0) -> bool:
+        """Health check an endpoint (GET /v1/models): put it back in the rotation if
+        it answers, eject it (again) otherwise."""
+        try:
+            healthy = self.session.get(endpoint.models_url, timeout=timeout).status_code == 200
+        except requests.exceptions.RequestException:
+            healthy = False
+        with self._pool_lock:
+            endpoint.probing = False
+            if healthy:
+                endpoint.ejected = False
+                endpoint.consecutive_failures = 0
+            elif endpoint.ejected:
+                # Still down, check again in eject_seconds
+                endpoint.ejected_until = time.monotonic() + self.eject_seconds
+            else:
+                self._eject(endpoint, "health check failed")
+        return healthy
+
+    def check_health(self, timeout: float = 2.0) -> Dict[str, bool]:
+        """Health check every endpoint now, without waiting for `eject_seconds`.
+        Returns the health of each endpoint URL."""
+        return {endpoint.url: self._probe(endpoint, timeout) for endpoint in self.endpoints}
+
+    def stats(self) -> Dict:
+        """Return the connector counters and the load and health of every endpoint."""
+        counters = super().stats()
+        with self._pool_lock:
+            counters['endpoints'] = [{
+                'url': endpoint.url,
+                'healthy': endpoint.healthy,
+                'outstanding': endpoint.outstanding,
+                'requests': endpoint.requests,
+                'failures': endpoint.failures,
+                'ejections': endpoint.ejections,
+                'latency': endpoint.latency
+            } for endpoint in self.endpoints]
+        return counters
@@ -1,17 +1,43 @@
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+import asyncio
 import random
-from typing import List, Dict, Optional
-from tqdm import tqdm
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Dict, Iterator, Optional, Tuple, TYPE_CHECKING
+from .BusinessCalendar import BusinessCalendar
+from .CircuitBreaker import CircuitOpenError
+from .XESWriter import XESWriter
+
+if TYPE_CHECKING:
+    # pandas and tqdm are imported where they are used, so importing the package stays cheap
+    import pandas as pd
+    from tqdm import tqdm
 
 class ProcessDataGenerator:
+    # Value pools of the categorical attributes, shared by both engines
+    PRIORITIES = ["Low", "Medium", "High"]
+    CHANNELS = ["Web", "Phone", "Email", "In-Person"]
+    STATUSES = ["Completed", "Delayed", "Expedited"]
+    SYSTEMS = ["System A", "System B", "System C"]
+
     def __init__(self, process_graph: Dict[str, List[str]],
                  num_cases: int = 100,
                  start_date: datetime = datetime(2023, 1, 1),
                  end_date: datetime = datetime(2023, 12, 31),
                  lmstudio_connector = None,
-                 process_name: str = "Generic Process"):
+                 process_name: str = "Generic Process",
+                 category_mode: str = "vocabulary",
+                 num_categories: int = 8,
+                 category_weights: Optional[List[float]] = None,
+                 departments: Optional[List[str]] = None,
+                 product_categories: Optional[List[str]] = None,
+                 engine: str = "python",
+                 seed: Optional[int] = None,
+                 calendar: Optional[BusinessCalendar] = None,
+                 resource_policy: str = "uniform",
+                 resource_weights: Optional[Dict[str, float]] = None,
+                 edge_weights: Optional[Dict[Tuple[str, str], float]] = None):
         """
         Initialize the Process Data Generator.
 
@@ -22,50 +48,346 @@ class ProcessDataGenerator:
             end_date: End date for the event log
             lmstudio_connector: Connector for LMStudio
             process_name: Name of the process (used for generating relevant departments)
+            category_mode: "vocabulary" asks LMStudio once for a pool of product categories
+                and samples cases from it locally; "per_case" asks LMStudio for every case
+            num_categories: Size of the product category pool in "vocabulary" mode
+            category_weights: Sampling weights for the category pool, in pool order.
+                Defaults to uniform sampling
+            departments: Departments to use instead of asking LMStudio for them
+            product_categories: Product category pool to use instead of asking LMStudio for it
+            engine: "python" builds every event as a dict; "numpy" draws all attributes as
+                arrays and assembles the DataFrame column-wise ("vocabulary" mode only)
+            seed: Seed of the random generator, makes the output of either engine reproducible
+            calendar: Working hours and days; defaults to 9:00-18:00, Monday to Friday
+            resource_policy: How an activity picks a resource of its department:
+                "uniform", "weighted" (by resource_weights) or "round_robin"
+            resource_weights: Relative weight of each resource for the "weighted" policy;
+                resources not listed weigh 1
+            edge_weights: Relative weight of each (source, target) edge when a case branches;
+                edges not listed weigh 1, so branching is uniform by default
         """
+        if category_mode not in ("vocabulary", "per_case"):
+            raise ValueError(f"Unknown category_mode: {category_mode}")
+        if engine not in ("python", "numpy"):
+            raise ValueError(f"Unknown engine: {engine}")
+        if engine == "numpy" and category_mode != "vocabulary":
+            raise ValueError("The numpy engine requires category_mode='vocabulary'")
+        if resource_policy not in ("uniform", "weighted", "round_robin"):
+            raise ValueError(f"Unknown resource_policy: {resource_policy}")
+
         self.process_graph = process_graph
         self.num_cases = num_cases
         self.start_date = start_date
         self.end_date = end_date
         self.process_name = process_name
         self.connector = lmstudio_connector
+        self.category_mode = category_mode
+        self.num_categories = max(1, num_categories)
+        self.category_weights = category_weights
+        self.engine = engine
+        self.rng = np.random.default_rng(seed)
+        # Scalar draws of the python engine come from a stdlib generator seeded by
+        # self.rng when a seed is given, so both engines are reproducible
+        self._random = random.Random(int(self.rng.integers(2 ** 63))) if seed is not None else random
+        self.calendar = calendar or BusinessCalendar()
 
         # Generate departments based on process name
-        self.departments = self._generate_departments()
+        self.departments = departments or self._generate_departments()
+
+        # Generate the product category pool once, cases sample from it
+        if self.category_mode == "vocabulary":
+            self.product_categories = product_categories or self._generate_product_categories()
+            if self.category_weights:
+                # The LLM may return fewer categories than weights or vice versa
+                size = min(len(self.product_categories), len(self.category_weights))
+                self.product_categories = self.product_categories[:size]
+                self.category_weights = list(self.category_weights[:size])
+        else:
+            self.product_categories = []
 
         # Configuration for realistic data generation
         self.resources = self._generate_resources()
         self.cost_ranges = self._generate_cost_ranges()
 
-    def _generate_departments(self) -> List[str]:
-        """Generate relevant departments based on process name using LMStudio."""
-        if self.connector:
-            prompt = f"""Given the process name '{self.process_name}', list 4-6 relevant department names that would be involved in this process.
+        # Integer-coded department -> resources index used for every resource draw
+        self.resource_policy = resource_policy
+        self.resource_weights = resource_weights or {}
+        self._build_resource_index()
+
+        # Transition matrix of the process graph used to sample case paths
+        self.edge_weights = edge_weights or {}
+        self._compile_transitions()
+
+        # Summary of the last complete generation run, accumulated chunk by chunk
+        self.summary: Optional[Dict] = None
+
+    @classmethod
+    async def create_async(cls, process_graph: Dict[str, List[str]],
+                           lmstudio_connector,
+                           process_name: str = "Generic Process",
+                           **kwargs) -> 'ProcessDataGenerator':
+        """
+        Create a generator whose departments and product categories are requested
+        concurrently through an AsyncLMStudioConnector, without blocking the event loop.
+
+        Args:
+            process_graph: Dictionary representing the process flow
+            lmstudio_connector: AsyncLMStudioConnector used for the prompts
+            process_name: Name of the process
+            **kwargs: Any other argument accepted by ProcessDataGenerator
+        """
+        category_mode = kwargs.get('category_mode', "vocabulary")
+        num_categories = max(1, kwargs.get('num_categories', 8))
+
+        prompts = [lmstudio_connector.get_answer_async(cls._departments_prompt(process_name))]
+        if category_mode == "vocabulary":
+            prompts.append(lmstudio_connector.get_answer_async(
+                cls._product_categories_prompt(process_name, num_categories)
+            ))
+        answers = await asyncio.gather(*prompts, return_exceptions=True)
+        for answer in answers:
+            if isinstance(answer, CircuitOpenError):
+                # The server is down, let the caller retry the process instead of using fallbacks
+                raise answer
+
+        if isinstance(answers[0], Exception):
+            print(f"Error generating departments: {answers[0]}")
+            departments = cls._fallback_departments()
+        else:
+            departments = cls._parse_departments(answers[0])
+
+        product_categories = None
+        if category_mode == "vocabulary":
+            if isinstance(answers[1], Exception):
+                print(f"Error generating product categories: {answers[1]}")
+                product_categories = cls._fallback_product_categories()
+            else:
+                product_categories = cls._parse_product_categories(answers[1], num_categories)
+
+        return cls(process_graph, lmstudio_connector=lmstudio_connector, process_name=process_name,
+                   departments=departments, product_categories=product_categories, **kwargs)
+
+    @staticmethod
+    def _departments_prompt(process_name: str) -> str:
+        """Prompt asking LMStudio for the departments involved in a process."""
+        return f"""Given the process name '{process_name}', list 4-6 relevant department names that would be involved in this process.
             Return only the department names separated by commas, no additional text.
             Example format: Sales, Operations, Customer Service, Legal"""
 
+    @staticmethod
+    def _parse_departments(departments_str: str) -> List[str]:
+        """Split the LMStudio answer into department names."""
+        return [dept.strip() for dept in departments_str.split(',')]
+
+    @staticmethod
+    def _fallback_departments() -> List[str]:
+        """Departments used when LMStudio is not available."""
+        return ["Sales", "Operations", "Customer Service", "Finance", "Legal"]
+
+    def _generate_departments(self) -> List[str]:
+        """Generate relevant departments based on process name using LMStudio."""
+        if self.connector:
             try:
-                departments_str = self.connector.get_answer(prompt)
-                departments = [dept.strip() for dept in departments_str.split(',')]
-                return departments
+                departments_str = self.connector.get_answer(self._departments_prompt(self.process_name))
+                return self._parse_departments(departments_str)
+            except CircuitOpenError:
+                # The server is down, let the caller retry the process instead of using fallbacks
+                raise
             except Exception as e:
                 print(f"Error generating departments: {e}")
                 # Fallback departments
-                return ["Sales", "Operations", "Customer Service", "Finance", "Legal"]
+                return self._fallback_departments()
         else:
             # Fallback departments if no connector is available
-            return ["Sales", "Operations", "Customer Service", "Finance", "Legal"]
+            return self._fallback_departments()
+
+    @staticmethod
+    def _product_categories_prompt(process_name: str, num_categories: int) -> str:
+        """Prompt asking LMStudio for a pool of product categories."""
+        return f"""Given the process '{process_name}', list {num_categories} distinct product category names.
+            Return only the category names separated by commas, no additional text."""
+
+    @staticmethod
+    def _parse_product_categories(categories_str: str, num_categories: int) -> List[str]:
+        """Split the LMStudio answer into at most `num_categories` distinct categories."""
+        categories = []
+        for category in categories_str.split(','):
+            category = category.strip().replace('\n', ' ').replace('"', '')
+            if category and category not in categories:
+                categories.append(category)
+        return categories[:num_categories] or ProcessDataGenerator._fallback_product_categories()
+
+    @staticmethod
+    def _fallback_product_categories() -> List[str]:
+        """Product categories used when LMStudio is not available."""
+        return ["Type A", "Type B", "Type C"]
+
+    def _generate_product_categories(self) -> List[str]:
+        """Generate a pool of product categories for the process with a single LMStudio call."""
+        if not self.connector:
+            return self._fallback_product_categories()
+
+        try:
+            categories_str = self.connector.get_answer(
+                self._product_categories_prompt(self.process_name, self.num_categories)
+            )
+            return self._parse_product_categories(categories_str, self.num_categories)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"Error generating product categories: {e}")
+            return self._fallback_product_categories()
 
     def _generate_resources(self) -> List[str]:
         """Generate resource names based on departments."""
         resources = []
         for dept in self.departments:
             # Generate 2-3 resources per department
-            num_resources = random.randint(2, 3)
+            num_resources = int(self.rng.integers(2, 4))
             dept_prefix = dept.split()[0]  # Take first word of department name
             resources.extend([f"{dept_prefix}_Agent_{i}" for i in range(1, num_resources + 1)])
         return resources
 
+    def _compile_transitions(self):
+        """Compile the process graph into an integer-indexed transition matrix in CSR form.
+
+        The successors of node `n` are `_transition_targets[indptr[n]:indptr[n + 1]]`, and
+        `_transition_cumulative` holds `n + ` the cumulative branch probabilities of each row,
+        so one searchsorted over the whole array draws the next node of any number of cases.
+        """
+        self.node_table = list(dict.fromkeys(
+            [node for node in self.process_graph] +
+            [target for targets in self.process_graph.values() for target in targets]
+        ))
+        node_codes = {node: i for i, node in enumerate(self.node_table)}
+        self._start_code = node_codes['START']
+        self._end_code = node_codes.get('END', -1)
+
+        indptr, targets, cumulative = [0], [], []
+        self._transition_weights = {}
+        for n, node in enumerate(self.node_table):
+            successors = self.process_graph.get(node, [])
+            weights = [float(self.edge_weights.get((node, target), 1.0)) for target in successors]
+            self._transition_weights[node] = weights
+            if successors:
+                row = np.cumsum(weights) / sum(weights)
+                row[-1] = 1.0  # Guard against rounding spilling into the next row
+                cumulative.extend(n + row)
+            targets.extend(node_codes[target] for target in successors)
+            indptr.append(len(targets))
+
+        self._transition_indptr = np.array(indptr, dtype=np.int64)
+        self._transition_targets = np.array(targets, dtype=np.int64)
+        self._transition_cumulative = np.array(cumulative, dtype=float)
+
+    def _sample_paths(self, num_cases: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Walk all cases through the transition matrix at once, one vectorized draw per step.
+
+        Returns:
+            The node codes visited by every case (excluding START and END), in case
+            order, and the number of activities in each case
+        """
+        out_degree = np.diff(self._transition_indptr)
+        active = np.arange(num_cases if out_degree[self._start_code] else 0)
+        current = np.full(num_cases, self._start_code, dtype=np.int64)
+        step_cases, step_nodes = [], []
+
+        while active.size:
+            edges = np.searchsorted(self._transition_cumulative, current + self.rng.random(active.size), side='right')
+            current = self._transition_targets[edges]
+
+            # Cases reaching END (or a node without successors) finish here
+            running = (current != self._end_code) & (out_degree[current] > 0)
+            step_cases.append(active[running])
+            step_nodes.append(current[running])
+            finished = (current != self._end_code) & ~running
+            if finished.any():
+                step_cases.append(active[finished])
+                step_nodes.append(current[finished])
+            active, current = active[running], current[running]
+
+        cases = np.concatenate(step_cases) if step_cases else np.empty(0, dtype=np.int64)
+        nodes = np.concatenate(step_nodes) if step_nodes else np.empty(0, dtype=np.int64)
+
+        # Steps were collected in order, a stable sort by case keeps each path's order
+        order = np.argsort(cases, kind='stable')
+        return nodes[order], np.bincount(cases, minlength=num_cases)
+
+    def _build_resource_index(self):
+        """Build the integer-coded department and resource tables.
+
+        The resources of department `d` are `resource_table[dept_resources[offsets[d]:offsets[d] + counts[d]]]`.
+        """
+        self.resource_table = np.array(list(dict.fromkeys(self.resources)), dtype=object)
+        resource_codes = {resource: i for i, resource in enumerate(self.resource_table)}
+
+        self.department_table = np.array(self.departments, dtype=object)
+        self.department_codes = {}
+        for i, dept in enumerate(self.departments):
+            self.department_codes.setdefault(dept, i)
+
+        dept_resources, offsets, counts = [], [], []
+        for dept in self.departments:
+            dept_prefix = dept.split()[0]  # Take first word of department name
+            codes = [resource_codes[r] for r in self.resource_table if r.startswith(dept_prefix)]
+            if not codes:
+                codes = list(range(len(self.resource_table)))
+            offsets.append(len(dept_resources))
+            counts.append(len(codes))
+            dept_resources.extend(codes)
+
+        self._dept_resources = np.array(dept_resources, dtype=np.int64)
+        self._dept_resource_offsets = np.array(offsets, dtype=np.int64)
+        self._dept_resource_counts = np.array(counts, dtype=np.int64)
+
+        # Per-department cumulative weights, shifted by the department code so a
+        # single searchsorted over the whole array serves every department
+        weights = np.array([self.resource_weights.get(r, 1.0) for r in self.resource_table[self._dept_resources]], dtype=float)
+        cumulative = np.empty_like(weights)
+        for d, (offset, count) in enumerate(zip(offsets, counts)):
+            dept_weights = weights[offset:offset + count]
+            cumulative[offset:offset + count] = d + np.cumsum(dept_weights) / dept_weights.sum()
+        self._dept_resource_cumulative = cumulative
+
+        # Next position of the round-robin policy in each department
+        self._round_robin_next = np.zeros(len(self.departments), dtype=np.int64)
+
+    def _select_resource(self, department: str) -> str:
+        """Pick a resource of `department` according to the resource policy."""
+        d = self.department_codes[department]
+        offset, count = self._dept_resource_offsets[d], self._dept_resource_counts[d]
+
+        if self.resource_policy == "round_robin":
+            position = self._round_robin_next[d] % count
+            self._round_robin_next[d] += 1
+        elif self.resource_policy == "weighted":
+            position = np.searchsorted(self._dept_resource_cumulative[offset:offset + count], d + self._random.random(), side='right')
+        else:
+            position = self._random.randrange(count)
+
+        return self.resource_table[self._dept_resources[offset + position]]
+
+    def _select_resources(self, event_department: np.ndarray) -> np.ndarray:
+        """Vectorized `_select_resource` over an array of department codes."""
+        offsets = self._dept_resource_offsets[event_department]
+        counts = self._dept_resource_counts[event_department]
+
+        if self.resource_policy == "round_robin":
+            # Rank of every event among the events of its department, in event order
+            order = np.argsort(event_department, kind='stable')
+            group_start = np.searchsorted(event_department[order], event_department[order])
+            rank = np.empty(len(event_department), dtype=np.int64)
+            rank[order] = np.arange(len(event_department)) - group_start
+            positions = (self._round_robin_next[event_department] + rank) % counts
+            self._round_robin_next += np.bincount(event_department, minlength=len(self.departments))
+            indices = offsets + positions
+        elif self.resource_policy == "weighted":
+            indices = np.searchsorted(self._dept_resource_cumulative, event_department + self.rng.random(len(event_department)), side='right')
+        else:
+            indices = offsets + (self.rng.random(len(event_department)) * counts).astype(np.int64)
+
+        return self.resource_table[self._dept_resources[indices]]
+
     def _generate_cost_ranges(self) -> Dict[str, tuple]:
         """Generate cost ranges for each department."""
         # if self.connector:
@@ -100,63 +422,51 @@ class ProcessDataGenerator:
 
     def _generate_case_attributes(self) -> Dict:
         """Generate attributes for a single case."""
-        if self.connector:
+        if self.category_mode == "vocabulary":
+            product_category = self._random.choices(self.product_categories, weights=self.category_weights)[0]
+        elif self.connector:
             prompt = f"""Given the process '{self.process_name}', suggest a product category name.
             Return only the category name, no additional text."""
             try:
-                product_category = self.connector.get_answer(prompt).strip()
-            except:
-                product_category = random.choice(["Type A", "Type B", "Type C"])
+                # Bypass the cache, otherwise every case would get the same category
+                product_category = self.connector.get_answer(prompt, use_cache=False).strip()
+            except CircuitOpenError:
+                # The server is down, let the caller retry the process instead of using fallbacks
+                raise
+            except Exception as e:
+                print(f"Error generating product category: {e}")
+                product_category = self._random.choice(["Type A", "Type B", "Type C"])
         else:
-            product_category = random.choice(["Type A", "Type B", "Type C"])
+            product_category = self._random.choice(["Type A", "Type B", "Type C"])
 
         return {
-            "customer_id": f"CUST_{random.randint(1000, 9999)}",
-            "priority": random.choice(["Low", "Medium", "High"]),
-            "channel": random.choice(["Web", "Phone", "Email", "In-Person"]),
-            "department": random.choice(self.departments),
+            "customer_id": f"CUST_{self._random.randint(1000, 9999)}",
+            "priority": self._random.choice(self.PRIORITIES),
+            "channel": self._random.choice(self.CHANNELS),
+            "department": self._random.choice(self.departments),
             "product_category": product_category,
-            "value": round(random.uniform(100, 10000), 2)
+            "value": round(self._random.uniform(100, 10000), 2)
         }
 
     # ... [Rest of the methods remain the same as in the previous version] ...
 
     def _generate_activity_attributes(self, activity: str, department: str) -> Dict:
         """Generate attributes for a single activity."""
-        base_duration = random.randint(30, 480)  # 30 mins to 8 hours in minutes
+        base_duration = self._random.randint(30, 480)  # 30 mins to 8 hours in minutes
         cost_range = self.cost_ranges[department]
 
-        # Filter resources by department
-        dept_prefix = department.split()[0]
-        dept_resources = [r for r in self.resources if r.startswith(dept_prefix)]
-
         return {
-            "resource": random.choice(dept_resources if dept_resources else self.resources),
+            "resource": self._select_resource(department),
             "duration_minutes": base_duration,
-            "cost": round(random.uniform(*cost_range), 2),
-            "status": random.choice(["Completed", "Delayed", "Expedited"]),
-            "system": random.choice(["System A", "System B", "System C"]),
-            "automated": random.choice([True, False])
+            "cost": round(self._random.uniform(*cost_range), 2),
+            "status": self._random.choice(self.STATUSES),
+            "system": self._random.choice(self.SYSTEMS),
+            "automated": self._random.choice([True, False])
         }
 
     def _generate_timestamp(self, base_time: datetime, activity_duration: int) -> datetime:
         """Generate a realistic timestamp considering working hours."""
-        working_hours = range(9, 18)  # 9 AM to 6 PM
-
-        current_time = base_time + timedelta(minutes=activity_duration)
-
-        # If outside working hours, move to next working day
-        while current_time.hour not in working_hours or current_time.weekday() >= 5:
-            if current_time.hour >= 18:
-                current_time = current_time.replace(hour=9, minute=0)
-                current_time += timedelta(days=1)
-            elif current_time.hour < 9:
-                current_time = current_time.replace(hour=9, minute=0)
-
-            if current_time.weekday() >= 5:  # Weekend
-                current_time += timedelta(days=8 - current_time.weekday())
-
-        return current_time
+        return self.calendar.add_working_minutes(base_time, activity_duration)
 
     def _generate_case_path(self) -> List[str]:
         """Generate a valid path through the process graph."""
@@ -165,75 +475,340 @@ class ProcessDataGenerator:
 
         while current != 'END':
             possible_next = self.process_graph[current]
-            current = random.choice(possible_next)
+            if self.edge_weights:
+                current = self._random.choices(possible_next, weights=self._transition_weights[current])[0]
+            else:
+                current = self._random.choice(possible_next)
             path.append(current)
 
         return path
 
-    def generate_data(self) -> pd.DataFrame:
+    # Columns of the event log, in output order
+    COLUMNS = ['case_id', 'activity', 'timestamp', 'complete_timestamp', 'customer_id', 'priority',
+               'channel', 'department', 'product_category', 'value', 'resource', 'duration_minutes',
+               'cost', 'status', 'system', 'automated']
+    # Both engines emit timestamps in this unit, so their chunks concat and compare consistently
+    TIMESTAMP_DTYPES = {'timestamp': 'datetime64[ns]', 'complete_timestamp': 'datetime64[ns]'}
+
+    def generate_data(self) -> 'pd.DataFrame':
         """Generate complete event log data with progress bar."""
-        events = []
+        import pandas as pd
+
+        chunks = list(self.iter_chunks(self.num_cases))
+        if not chunks:
+            return pd.DataFrame(columns=self.COLUMNS).astype(self.TIMESTAMP_DTYPES)
+        return pd.concat(chunks, ignore_index=True)
+
+    def iter_chunks(self, chunk_size: int = 10000) -> Iterator['pd.DataFrame']:
+        """Generate the event log in chunks of `chunk_size` cases.
+
+        Cases are produced in case_id order and every case lies in a single chunk,
+        so concatenating the chunks gives the full, sorted event log while only one
+        chunk is held in memory at a time.
+        """
+        from tqdm import tqdm
+
+        chunk_size = max(1, chunk_size)
+        self.summary = None
+        totals = self._new_summary_totals()
 
         # Create progress bar for case generation
         with tqdm(total=self.num_cases, desc="Generating cases") as pbar:
-            for case_id in range(1, self.num_cases + 1):
-                case_attrs = self._generate_case_attributes()
-                path = self._generate_case_path()
-
-                # Initialize case start time randomly between start_date and end_date
-                current_time = self.start_date + (self.end_date - self.start_date) * random.random()
-
-                for activity in path:
-                    if activity in ['START', 'END']:
-                        continue
-
-                    activity_attrs = self._generate_activity_attributes(activity, case_attrs['department'])
-
-                    # Generate timestamp and calculate complete_timestamp
-                    timestamp = self._generate_timestamp(current_time, 0)
-                    complete_timestamp = self._generate_timestamp(timestamp, activity_attrs['duration_minutes'])
-                    current_time = complete_timestamp
-
-                    event = {
-                        'case_id': f"CASE_{case_id:05d}",
-                        'activity': activity,
-                        'timestamp': timestamp,
-                        'complete_timestamp': complete_timestamp,
-                        **case_attrs,
-                        **activity_attrs
-                    }
-                    events.append(event)
+            for first_case in range(1, self.num_cases + 1, chunk_size):
+                num_cases = min(chunk_size, self.num_cases + 1 - first_case)
+                if self.engine == "numpy":
+                    chunk = self._generate_cases_numpy(first_case, num_cases)
+                    pbar.update(num_cases)
+                else:
+                    chunk = self._generate_cases_python(first_case, num_cases, pbar)
+                self._accumulate_summary(totals, chunk)
+                yield chunk
+
+        # Only a run that produced every case describes the log
+        self.summary = self._finalize_summary(totals)
+
+    def _generate_cases_python(self, first_case: int, num_cases: int, pbar: Optional['tqdm'] = None) -> 'pd.DataFrame':
+        """Generate the events of `num_cases` cases, one dict per event."""
+        import pandas as pd
 
-                pbar.update(1)
+        events = []
+
+        for case_id in range(first_case, first_case + num_cases):
+            case_attrs = self._generate_case_attributes()
+            path = self._generate_case_path()
 
-        # Create DataFrame and sort by timestamp
-        df = pd.DataFrame(events)
-        df = df.sort_values(['case_id', 'timestamp'])
+            # Initialize case start time randomly between start_date and end_date
+            current_time = self.start_date + (self.end_date - self.start_date) * self._random.random()
 
-        return df
+            for activity in path:
+                if activity in ['START', 'END']:
+                    continue
 
-    def save_to_csv(self, filename: str = 'process_data.csv'):
-        """Generate data and save to CSV file."""
-        df = self.generate_data()
-        df.to_csv("data/" + filename, index=False)
-        print(f"Generated {len(df)} events for {self.num_cases} cases")
+                activity_attrs = self._generate_activity_attributes(activity, case_attrs['department'])
+
+                # Generate timestamp and calculate complete_timestamp
+                timestamp = self._generate_timestamp(current_time, 0)
+                complete_timestamp = self._generate_timestamp(timestamp, activity_attrs['duration_minutes'])
+                current_time = complete_timestamp
+
+                event = {
+                    'case_id': f"CASE_{case_id:05d}",
+                    'activity': activity,
+                    'timestamp': timestamp,
+                    'complete_timestamp': complete_timestamp,
+                    **case_attrs,
+                    **activity_attrs
+                }
+                events.append(event)
+
+            if pbar is not None:
+                pbar.update(1)
+
+        # Events are already in case_id and timestamp order
+        return pd.DataFrame(events, columns=self.COLUMNS).astype(self.TIMESTAMP_DTYPES)
+
+    def _generate_cases_numpy(self, first_case: int, num_cases: int) -> 'pd.DataFrame':
+        """Generate the events of `num_cases` cases with whole-array draws from a single NumPy generator."""
+        import pandas as pd
+
+        rng = self.rng
+
+        # Sample the path of every case, as node codes into `node_table`
+        path_codes, path_lengths = self._sample_paths(num_cases)
+
+        num_events = int(path_lengths.sum())
+        event_case = np.repeat(np.arange(num_cases), path_lengths)
+
+        # Case attributes, one draw per case
+        case_department = rng.integers(len(self.departments), size=num_cases)
+        weights = None
+        if self.category_weights:
+            weights = np.asarray(self.category_weights, dtype=float)
+            weights = weights / weights.sum()
+        case_category = rng.choice(len(self.product_categories), size=num_cases, p=weights)
+        case_ids = np.array([f"CASE_{case_id:05d}" for case_id in range(first_case, first_case + num_cases)], dtype=object)
+        customer_ids = np.char.add("CUST_", rng.integers(1000, 10000, size=num_cases).astype(str)).astype(object)
+
+        span = int((self.end_date - self.start_date).total_seconds() // 60)
+        case_start = np.datetime64(self.start_date, 'm') + (rng.random(num_cases) * span).astype('timedelta64[m]')
+
+        # Activity attributes, one draw per event
+        event_department = case_department[event_case]
+        durations = rng.integers(30, 481, size=num_events)
+
+        cost_ranges = np.array([self.cost_ranges[dept] for dept in self.departments], dtype=float)
+        low, high = cost_ranges[event_department, 0], cost_ranges[event_department, 1]
+        costs = np.round(low + (high - low) * rng.random(num_events), 2)
+
+        # Timestamps chain within each case: in working minutes, every event starts
+        # where the previous one completed, so each case is a cumulative sum
+        elapsed = np.cumsum(durations) - durations
+        case_first_event = np.cumsum(path_lengths) - path_lengths
+        elapsed -= elapsed[case_first_event[event_case]]
+        start_minutes = self.calendar.to_working_minutes(case_start)[event_case] + elapsed
+        timestamps = self.calendar.from_working_minutes(start_minutes)
+        complete_timestamps = self.calendar.from_working_minutes(start_minutes + durations)
+
+        return pd.DataFrame({
+            'case_id': case_ids[event_case],
+            'activity': np.array(self.node_table, dtype=object)[path_codes],
+            'timestamp': timestamps.astype(self.TIMESTAMP_DTYPES['timestamp']),
+            'complete_timestamp': complete_timestamps.astype(self.TIMESTAMP_DTYPES['complete_timestamp']),
+            'customer_id': customer_ids[event_case],
+            'priority': np.array(self.PRIORITIES, dtype=object)[rng.integers(len(self.PRIORITIES), size=num_cases)][event_case],
+            'channel': np.array(self.CHANNELS, dtype=object)[rng.integers(len(self.CHANNELS), size=num_cases)][event_case],
+            'department': self.department_table[event_department],
+            'product_category': np.array(self.product_categories, dtype=object)[case_category][event_case],
+            'value': np.round(rng.uniform(100, 10000, size=num_cases), 2)[event_case],
+            'resource': self._select_resources(event_department),
+            'duration_minutes': durations,
+            'cost': costs,
+            'status': np.array(self.STATUSES, dtype=object)[rng.integers(len(self.STATUSES), size=num_events)],
+            'system': np.array(self.SYSTEMS, dtype=object)[rng.integers(len(self.SYSTEMS), size=num_events)],
+            'automated': rng.random(num_events) < 0.5
+        })
+
+    def save_to_csv(self, filename: str = 'process_data.csv', chunk_size: Optional[int] = None):
+        """Generate data and save to CSV file.
+
+        With `chunk_size`, cases are generated and appended to the file `chunk_size`
+        at a time, so memory stays bounded regardless of the size of the log.
+        """
+        path = "data/" + filename
+        if chunk_size is None:
+            df = self.generate_data()
+            df.to_csv(path, index=False)
+            num_events = len(df)
+        else:
+            num_events = 0
+            for i, chunk in enumerate(self.iter_chunks(chunk_size)):
+                chunk.to_csv(path, index=False, mode='w' if i == 0 else 'a', header=i == 0)
+                num_events += len(chunk)
+
+        print(f"Generated {num_events} events for {self.num_cases} cases")
         print(f"Data saved to {filename}")
 
-    def get_data_summary(self, df: Optional[pd.DataFrame] = None) -> Dict:
-        """Get summary statistics of the generated data."""
+    def _arrow_schema(self):
+        """Arrow schema of the event log: dictionary-encoded strings and timestamp columns."""
+        import pyarrow as pa
+
+        string = pa.dictionary(pa.int32(), pa.string())
+        return pa.schema([
+            ('case_id', string),
+            ('activity', string),
+            ('timestamp', pa.timestamp('us')),
+            ('complete_timestamp', pa.timestamp('us')),
+            ('customer_id', string),
+            ('priority', string),
+            ('channel', string),
+            ('department', string),
+            ('product_category', string),
+            ('value', pa.float64()),
+            ('resource', string),
+            ('duration_minutes', pa.int64()),
+            ('cost', pa.float64()),
+            ('status', string),
+            ('system', string),
+            ('automated', pa.bool_())
+        ])
+
+    def to_arrow_table(self, df: Optional['pd.DataFrame'] = None):
+        """Convert the event log (generated if `df` is not given) to a pyarrow Table."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is not installed. Please install it with: pip install pyarrow")
+
         if df is None:
             df = self.generate_data()
 
-        summary = {
-            'total_cases': df['case_id'].nunique(),
-            'total_events': len(df),
-            'unique_activities': df['activity'].nunique(),
-            'unique_resources': df['resource'].nunique(),
-            'avg_case_duration': (df.groupby('case_id')['complete_timestamp'].max() -
-                                df.groupby('case_id')['timestamp'].min()).mean(),
-            'avg_events_per_case': len(df) / df['case_id'].nunique(),
-            'total_cost': df['cost'].sum(),
-            'avg_cost_per_case': df.groupby('case_id')['cost'].sum().mean()
+        schema = self._arrow_schema()
+        arrays = []
+        for field in schema:
+            if pa.types.is_dictionary(field.type):
+                array = pa.array(df[field.name].to_numpy(dtype=object), type=pa.string()).dictionary_encode()
+            else:
+                array = pa.Array.from_pandas(df[field.name]).cast(field.type, safe=False)
+            arrays.append(array)
+
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def save_to_parquet(self, filename: str = 'process_data.parquet', compression: str = 'zstd',
+                        chunk_size: int = 50000):
+        """Generate data and save it to a Parquet file.
+
+        Each chunk of `chunk_size` cases is converted to Arrow and written as its
+        own row group, so memory stays bounded by one chunk.
+
+        Args:
+            filename: Name of the file, written in the data directory
+            compression: Parquet codec ('zstd', 'snappy', 'gzip', 'brotli', 'lz4' or 'none')
+            chunk_size: Number of cases per row group
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is not installed. Please install it with: pip install pyarrow")
+
+        num_events = 0
+        with pq.ParquetWriter("data/" + filename, self._arrow_schema(), compression=compression) as writer:
+            for chunk in self.iter_chunks(chunk_size):
+                writer.write_table(self.to_arrow_table(chunk), row_group_size=max(1, len(chunk)))
+                num_events += len(chunk)
+
+        print(f"Generated {num_events} events for {self.num_cases} cases")
+        print(f"Data saved to {filename}")
+
+    # Columns stored once per trace in XES, the rest are event attributes
+    CASE_COLUMNS = ['customer_id', 'priority', 'channel', 'department', 'product_category', 'value']
+
+    def save_to_xes(self, filename: str = 'process_data.xes.gz', chunk_size: int = 1000):
+        """Generate data and stream it to an IEEE XES file.
+
+        Every activity becomes a start and a complete event (lifecycle:transition).
+        Traces are written as their chunk of `chunk_size` cases is generated, so
+        memory stays constant. Filenames ending in `.gz` are gzip-compressed.
+        """
+        with XESWriter("data/" + filename, log_name=self.process_name) as writer:
+            for chunk in self.iter_chunks(chunk_size):
+                rows = chunk.to_dict('records')
+                for case_id, case_rows in groupby(rows, key=itemgetter('case_id')):
+                    case_rows = list(case_rows)
+                    events = []
+                    for row in case_rows:
+                        events.append({
+                            'concept:name': row['activity'],
+                            'lifecycle:transition': 'start',
+                            'time:timestamp': row['timestamp'],
+                            'org:resource': row['resource']
+                        })
+                        events.append({
+                            'concept:name': row['activity'],
+                            'lifecycle:transition': 'complete',
+                            'time:timestamp': row['complete_timestamp'],
+                            'org:resource': row['resource'],
+                            'duration_minutes': row['duration_minutes'],
+                            'cost': row['cost'],
+                            'status': row['status'],
+                            'system': row['system'],
+                            'automated': row['automated']
+                        })
+                    writer.write_trace(case_id, {col: case_rows[0][col] for col in self.CASE_COLUMNS}, events)
+
+        print(f"Generated {writer.num_events // 2} events for {writer.num_traces} cases")
+        print(f"Data saved to {filename}")
+
+    @staticmethod
+    def _new_summary_totals() -> Dict:
+        """Running totals from which the summary of an event log is computed."""
+        return {'cases': 0, 'events': 0, 'activities': set(), 'resources': set(),
+                'duration': np.timedelta64(0, 'ns'), 'cost': 0.0}
+
+    @staticmethod
+    def _accumulate_summary(totals: Dict, chunk: 'pd.DataFrame'):
+        """Add the events of a chunk to the running totals.
+
+        Every case lies in a single chunk, so per-case aggregates are final as
+        soon as the chunk has been seen.
+        """
+        cases = chunk.groupby('case_id', sort=False).agg(start=('timestamp', 'min'), end=('complete_timestamp', 'max'))
+        totals['cases'] += len(cases)
+        totals['events'] += len(chunk)
+        totals['activities'].update(chunk['activity'].unique())
+        totals['resources'].update(chunk['resource'].unique())
+        totals['duration'] += (cases['end'] - cases['start']).to_numpy().sum()
+        totals['cost'] += float(chunk['cost'].sum())
+
+    @staticmethod
+    def _finalize_summary(totals: Dict) -> Dict:
+        """Turn the running totals into the summary returned by get_data_summary."""
+        import pandas as pd
+
+        cases = totals['cases']
+        return {
+            'total_cases': cases,
+            'total_events': totals['events'],
+            'unique_activities': len(totals['activities']),
+            'unique_resources': len(totals['resources']),
+            'avg_case_duration': pd.Timedelta(totals['duration'] / cases) if cases else None,
+            'avg_events_per_case': totals['events'] / cases if cases else None,
+            'total_cost': totals['cost'],
+            'avg_cost_per_case': totals['cost'] / cases if cases else None
         }
 
-        return summary
\ No newline at end of file
+    def get_data_summary(self, df: Optional['pd.DataFrame'] = None) -> Dict:
+        """Get summary statistics of the generated data.
+
+        Without a DataFrame this is the summary accumulated during the last
+        complete run (generate_data, iter_chunks or any save_to_* method); if
+        there was none, the log is generated once in chunks just to summarize it.
+        """
+        if df is not None:
+            totals = self._new_summary_totals()
+            self._accumulate_summary(totals, df)
+            return self._finalize_summary(totals)
+
+        if self.summary is None:
+            for _ in self.iter_chunks():
+                pass
+        return self.summary
@@ -1,246 +1,435 @@
-import random
-from typing import Dict, List, Set, Tuple
-import networkx as nx
-import matplotlib.pyplot as plt
+import json
+import os
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from .CircuitBreaker import CircuitOpenError
+from .ProcessGraph import ProcessGraph
+from .GraphRenderer import GraphRenderer
+from ._blocking import run_blocking
+from ._pool import create_process_pool
+
+# Node ids of the fixed nodes; activities follow them in creation order
+START, END = 0, 1
+
+def _generate_shard(settings: Dict[str, int], seed: int, first_index: int, last_index: int) -> List[ProcessGraph]:
+    """Generate models [first_index, last_index) of a generate_many batch in a worker process."""
+    generator = ProcessGenerator(**settings)
+    return [generator.regenerate(seed, index) for index in range(first_index, last_index)]
 
 class ProcessGenerator:
-    def __init__(self, min_nodes: int = 5, max_nodes: int = 10, min_connections: int = 1, max_connections: int = 3, process_name: str = 'Process', lmstudio_connector = None):
+    def __init__(self, min_nodes: int = 5, max_nodes: int = 10, min_connections: int = 1, max_connections: int = 3, process_name: str = 'Process', lmstudio_connector = None, naming_mode: str = 'batch', max_naming_attempts: int = 3, seed: Optional[int] = None):
+        if naming_mode not in ('batch', 'sequential'):
+            raise ValueError(f"Unknown naming_mode: {naming_mode}")
+
         self.min_nodes = max(3, min_nodes)  # Minimum 3 nodes (START, 1 activity, END)
         self.max_nodes = max_nodes
         self.min_connections = max(1, min_connections)
         self.max_connections = max(self.min_connections, max_connections)
-        self.graph: Dict[str, List[str]] = {}
+        self.graph: Dict[str, List[str]] = {}  # Dict form, produced at the API boundary
         self.nodes: List[str] = []
+        self.process_graph: ProcessGraph = None  # Integer-indexed form used internally
+        self.rng = np.random.default_rng(seed)
+        self.root_seed: Optional[int] = None  # Root seed of the last generate_many call
         self.process_name = process_name
         self.lmstudio_connector = lmstudio_connector
         self.node_descriptions: Dict[str, str] = {}
         self.used_names: Set[str] = {'START', 'END'}  # Track used names
+        self.naming_mode = naming_mode  # 'batch': one prompt for the whole graph, 'sequential': one per node
+        self.max_naming_attempts = max(1, max_naming_attempts)
 
-    def _generate_connections(self):
-        """Generate random connections between nodes."""
-        for i, node in enumerate(self.nodes):
-            if node == 'END':
-                continue
-
-            # Calculate remaining possible nodes for connections
-            remaining_nodes = self.nodes[i+1:]
-            if not remaining_nodes:
-                continue
+    def _generate_connections(self, num_nodes: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate random forward connections between nodes.
 
-            # Determine number of outgoing connections
-            max_possible_connections = len(remaining_nodes)
-            actual_max_connections = min(self.max_connections, max_possible_connections)
-            actual_min_connections = min(self.min_connections, max_possible_connections)
+        All out-degrees are drawn at once and the targets are sampled column by
+        column: each new pick is drawn from the not yet chosen positions and
+        shifted past the earlier picks of its row, which keeps every row free
+        of duplicates without materialising the candidate lists.
 
-            if actual_min_connections > actual_max_connections:
-                actual_min_connections = actual_max_connections
-
-            # Generate connections
-            num_connections = random.randint(actual_min_connections, actual_max_connections)
-            targets = random.sample(remaining_nodes, num_connections)
-            self.graph[node] = targets
-
-    def _ensure_valid_process(self):
+        Returns:
+            The (sources, targets) arrays of the edges
+        """
+        nodes = np.arange(num_nodes)
+
+        # Calculate remaining possible nodes for connections (END never connects)
+        remaining = num_nodes - nodes - 1
+        remaining[END] = 0
+
+        # Determine number of outgoing connections
+        actual_max_connections = np.minimum(self.max_connections, remaining)
+        actual_min_connections = np.minimum(self.min_connections, remaining)
+        num_connections = rng.integers(actual_min_connections, actual_max_connections + 1)
+
+        # Generate connections to later nodes, as offsets into each node's remaining range
+        width = int(num_connections.max(initial=0))
+        picks = np.full((num_nodes, width), -1, dtype=np.int64)
+        for column in range(width):
+            rows = np.flatnonzero(num_connections > column)
+            offsets = rng.integers(0, remaining[rows] - column)
+            for previous in np.sort(picks[rows, :column], axis=1).T:
+                offsets += offsets >= previous
+            picks[rows, column] = offsets
+
+        mask = picks >= 0
+        sources = np.broadcast_to(nodes[:, None], picks.shape)[mask]
+        return sources, sources + 1 + picks[mask]
+
+    def _ensure_valid_process(self, num_nodes: int, sources: np.ndarray, targets: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
         """Ensure the process follows basic modeling rules:
         - START: only outgoing connections (not to END)
         - END: only incoming connections
         - Other nodes: at least one incoming and one outgoing connection
+
+        Returns:
+            The repaired (sources, targets) arrays
         """
-        # Clear any incoming connections to START and direct connections to END from START
-        for node, targets in self.graph.items():
-            if 'START' in targets:
-                targets.remove('START')
-            if node == 'START' and 'END' in targets:
-                targets.remove('END')
-
-        # Clear any outgoing connections from END
-        if 'END' in self.graph:
-            self.graph['END'] = []
-
-        # Ensure START has at least one outgoing connection
-        if not self.graph['START']:
-            possible_targets = [n for n in self.nodes if n not in ['START', 'END']]
-            if possible_targets:
-                self.graph['START'] = [random.choice(possible_targets)]
-            else:
-                # If there are no middle nodes, we need to add one
-                new_node = 'Activity_1'
-                self.nodes.insert(-1, new_node)  # Insert before END
-                self.graph[new_node] = ['END']
-                self.graph['START'] = [new_node]
-
-        # Check each activity node (excluding START and END)
-        for node in self.nodes:
-            if node in ['START', 'END']:
-                continue
 
-            # Ensure at least one outgoing connection
-            if not self.graph[node]:
-                possible_targets = [n for n in self.nodes if n not in ['START', node] and self.nodes.index(n) > self.nodes.index(node)]
-                if 'END' in possible_targets and len(possible_targets) > 1:
-                    possible_targets.remove('END')  # Prefer connecting to intermediate nodes if available
-                if possible_targets:
-                    self.graph[node] = [random.choice(possible_targets)]
-                else:
-                    self.graph[node] = ['END']
-
-            # Ensure at least one incoming connection
-            has_incoming = False
-            for source, targets in self.graph.items():
-                if node in targets:
-                    has_incoming = True
-                    break
-
-            if not has_incoming:
-                possible_sources = [n for n in self.nodes if n not in ['END', node] and self.nodes.index(n) < self.nodes.index(node)]
-                if possible_sources:
-                    source = random.choice(possible_sources)
-                    if node not in self.graph[source]:
-                        self.graph[source].append(node)
-                else:
-                    self.graph['START'].append(node)
+        # Clear any incoming connections to START, direct connections to END from START
+        # and outgoing connections from END
+        keep = (targets != START) & ~((sources == START) & (targets == END)) & (sources != END)
+        sources, targets = sources[keep], targets[keep]
+        extra_sources, extra_targets = [], []
+
+        # Ensure START has at least one outgoing connection (there is always an activity,
+        # since min_nodes is at least 3)
+        if not np.any(sources == START):
+            extra_sources.append([START])
+            extra_targets.append(rng.integers(END + 1, num_nodes, size=1))
+
+        # Ensure every activity has at least one outgoing connection. Connections only go
+        # forward and at least one is drawn while nodes remain, so only the last activity
+        # can lack one and it leads to END
+        out_degree = np.bincount(sources, minlength=num_nodes)
+        dangling = np.flatnonzero(out_degree[END + 1:] == 0) + END + 1
+        extra_sources.append(dangling)
+        extra_targets.append(np.full(len(dangling), END))
+
+        # Ensure every activity has at least one incoming connection, from START or an
+        # earlier activity. Such a node has no predecessors, so the edge cannot exist yet
+        in_degree = np.bincount(np.concatenate([targets] + extra_targets).astype(np.int64), minlength=num_nodes)
+        orphans = np.flatnonzero(in_degree[END + 1:] == 0) + END + 1
+        choice = rng.integers(0, orphans - END)  # START plus the activities before the node
+        extra_sources.append(np.where(choice == 0, START, choice + END))
+        extra_targets.append(orphans)
+
+        sources = np.concatenate([sources] + extra_sources).astype(np.int64)
+        targets = np.concatenate([targets] + extra_targets).astype(np.int64)
 
         # Ensure there is at least one path to END
-        has_path_to_end = False
-        for node, targets in self.graph.items():
-            if node != 'START' and 'END' in targets:
-                has_path_to_end = True
-                break
+        if not np.any(targets == END):
+            sources = np.append(sources, num_nodes - 1)
+            targets = np.append(targets, END)
+
+        return sources, targets
+
+    async def _ask_blocking(self, prompt: str, use_cache: bool) -> str:
+        """Prompt through the synchronous connector API, for naming run by run_blocking."""
+        return self.lmstudio_connector.get_answer(prompt, use_cache=use_cache)
 
-        if not has_path_to_end:
-            # Find nodes without outgoing connections or with the highest index
-            last_nodes = [n for n in self.nodes[1:-1] if not self.graph[n]]  # Exclude START and END
-            if last_nodes:
-                self.graph[last_nodes[-1]].append('END')
-            else:
-                # Find any middle node to connect to END
-                middle_nodes = [n for n in self.nodes if n not in ['START', 'END']]
-                if middle_nodes:
-                    self.graph[middle_nodes[-1]].append('END')
-                else:
-                    # Create a new middle node if necessary
-                    new_node = 'Activity_1'
-                    self.nodes.insert(-1, new_node)
-                    self.graph[new_node] = ['END']
-                    self.graph['START'] = [new_node]
-
-    def _get_activity_name(self, node: str, incoming_nodes: List[str], outgoing_nodes: List[str], attempt: int = 1) -> str:
-        """Generate a unique descriptive name for an activity using LMStudio."""
+    async def _ask_async(self, prompt: str, use_cache: bool) -> str:
+        """Prompt through an AsyncLMStudioConnector, limited by the connector like every async prompt."""
+        return await self.lmstudio_connector.get_answer_async(prompt, use_cache=use_cache)
+
+    async def _get_activity_name(self, ask, node: str, incoming_nodes: List[str], outgoing_nodes: List[str]) -> str:
+        """Generate a unique descriptive name for an activity, prompting through `ask`."""
         if not self.lmstudio_connector or node in ['START', 'END']:
             return node
 
+        try:
+            for attempt in range(1, self.max_naming_attempts + 1):
+                # Retries must reach the LLM, a cached answer would collide again
+                answer = await ask(self._activity_prompt(incoming_nodes, outgoing_nodes, attempt), attempt == 1)
+                activity_name = self._accept_activity_name(answer, attempt)
+                if activity_name is not None:
+                    return activity_name
+
+        except CircuitOpenError:
+            # The server is down, let the caller retry the process instead of naming it Activity_N
+            raise
+        except Exception as e:
+            print(f"Error generating name for {node}: {e}")
+            return self._get_fallback_name()
+
+    def _activity_prompt(self, incoming_nodes: List[str], outgoing_nodes: List[str], attempt: int) -> str:
+        """Prompt naming a single activity from its neighbours."""
         # Adjust prompt based on attempt number to encourage variety
         if attempt == 1:
             uniqueness_instruction = ""
         else:
             uniqueness_instruction = f"\nThe name must be different from: {', '.join(self.used_names - {'START', 'END'})}"
 
-        prompt = f"""In the process '{self.process_name}', name an activity that:
+        return f"""In the process '{self.process_name}', name an activity that:
             - Comes after activities: {', '.join(incoming_nodes) if incoming_nodes else 'START'}
             - Leads to activities: {', '.join(outgoing_nodes) if outgoing_nodes else 'END'}{uniqueness_instruction}
 
             Return only the activity name (2-4 words maximum), no additional text or punctuation."""
 
-        try:
-            activity_name = self.lmstudio_connector.get_answer(prompt)
-            # Clean up the response
-            activity_name = activity_name.strip().replace('\n', ' ').replace('"', '').replace("'", "")
-
-            # Check if name is already used
-            if activity_name in self.used_names:
-                if attempt < 3:  # Try up to 3 times to get a unique name
-                    return self._get_activity_name(node, incoming_nodes, outgoing_nodes, attempt + 1)
-                else:
-                    # If still not unique, append a number
-                    base_name = activity_name
-                    counter = 1
-                    while activity_name in self.used_names:
-                        activity_name = f"{base_name} {counter}"
-                        counter += 1
-
-            self.used_names.add(activity_name)
-            return activity_name
+    def _accept_activity_name(self, answer: str, attempt: int) -> Optional[str]:
+        """Clean up and reserve an activity name, or return None to ask again for a unique one."""
+        activity_name = answer.strip().replace('\n', ' ').replace('"', '').replace("'", "")
 
-        except Exception as e:
-            print(f"Error generating name for {node}: {e}")
-            # Generate a fallback unique name
+        # Check if name is already used
+        if activity_name in self.used_names:
+            if attempt < self.max_naming_attempts:
+                return None
+            # If still not unique, append a number
+            base_name = activity_name
             counter = 1
-            while f"Activity_{counter}" in self.used_names:
+            while activity_name in self.used_names:
+                activity_name = f"{base_name} {counter}"
                 counter += 1
-            fallback_name = f"Activity_{counter}"
-            self.used_names.add(fallback_name)
-            return fallback_name
 
-    def _get_incoming_nodes(self, target_node: str) -> List[str]:
-        """Get all nodes that have edges pointing to the target node."""
-        return [node for node, targets in self.graph.items() if target_node in targets]
+        self.used_names.add(activity_name)
+        return activity_name
+
+    def _get_fallback_name(self) -> str:
+        """Generate a fallback unique name of the form Activity_N."""
+        counter = 1
+        while f"Activity_{counter}" in self.used_names:
+            counter += 1
+        fallback_name = f"Activity_{counter}"
+        self.used_names.add(fallback_name)
+        return fallback_name
+
+    def _describe_neighbours(self, node: int, node_mapping: Dict[int, str]) -> Tuple[List[str], List[str]]:
+        """Return the current names of the predecessors and successors of a node."""
+        labels = self.process_graph.labels
+        incoming_nodes = [node_mapping.get(n, labels[n]) for n in self.process_graph.predecessors(node)]
+        outgoing_nodes = [node_mapping.get(n, labels[n]) for n in self.process_graph.successors(node)]
+        return incoming_nodes, outgoing_nodes
+
+    def _build_batch_naming_prompt(self, pending: List[int], node_mapping: Dict[int, str]) -> str:
+        """Build a single prompt asking for the names of all pending nodes as a JSON object."""
+        labels = self.process_graph.labels
+        descriptions = []
+        for node in pending:
+            incoming_nodes, outgoing_nodes = self._describe_neighbours(node, node_mapping)
+            descriptions.append(
+                f"- {labels[node]}: comes after {', '.join(incoming_nodes) if incoming_nodes else 'START'}; "
+                f"leads to {', '.join(outgoing_nodes) if outgoing_nodes else 'END'}"
+            )
+
+        taken_names = sorted(self.used_names - {'START', 'END'})
+        uniqueness_instruction = f"\nThe names must be different from: {', '.join(taken_names)}" if taken_names else ""
+        nodes_block = '\n            '.join(descriptions)
+
+        return f"""In the process '{self.process_name}', name each of these activities:
+            {nodes_block}{uniqueness_instruction}
+
+            Every name must be unique and 2-4 words maximum.
+            Return only a JSON object mapping each activity ID to its name, for example: {{"{labels[pending[0]]}": "Review Request"}}"""
+
+    def _parse_batch_names(self, answer: str, pending: List[int]) -> Dict[int, str]:
+        """Extract the unique, valid names for the pending nodes from a JSON answer."""
+        start, end = answer.find('{'), answer.rfind('}')
+        try:
+            parsed = json.loads(answer[start:end + 1])
+        except ValueError:
+            return {}
+        if not isinstance(parsed, dict):
+            return {}
+
+        names = {}
+        for node in pending:
+            name = parsed.get(self.process_graph.labels[node])
+            if not isinstance(name, str):
+                continue
+            name = name.strip().replace('\n', ' ').replace('"', '').replace("'", "")
+            if name and name not in self.used_names:
+                self.used_names.add(name)
+                names[node] = name
+        return names
 
-    def generate_process(self) -> Dict[str, List[str]]:
-        """Generate a random process with start and end activities."""
-        # Reset graph
-        self.graph = {}
-        self.node_descriptions = {}
+    async def _get_activity_names_batch(self, ask) -> Dict[int, str]:
+        """Name every activity with one structured LLM request for the whole graph.
+
+        Only the nodes whose name collides or could not be parsed are re-requested.
+        """
+        node_mapping: Dict[int, str] = {}
+        pending = list(range(END + 1, self.process_graph.num_nodes))
+
+        for attempt in range(1, self.max_naming_attempts + 1):
+            if not pending:
+                break
 
+            prompt = self._build_batch_naming_prompt(pending, node_mapping)
+            try:
+                # Retries must reach the LLM, a cached answer would collide again
+                answer = await ask(prompt, attempt == 1)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                print(f"Error generating names for {self.process_name}: {e}")
+                for node in pending:
+                    node_mapping[node] = self._get_fallback_name()
+                return node_mapping
+
+            node_mapping.update(self._parse_batch_names(answer, pending))
+            pending = [node for node in pending if node not in node_mapping]
+
+        # Name whatever is still missing one node at a time
+        for node in pending:
+            node_mapping[node] = await self._get_activity_name(
+                ask, self.process_graph.labels[node], *self._describe_neighbours(node, node_mapping)
+            )
+
+        return node_mapping
+
+    async def _get_activity_names_sequential(self, ask) -> Dict[int, str]:
+        """Name every activity with one LLM request per node."""
+        node_mapping: Dict[int, str] = {}
+
+        for node in range(END + 1, self.process_graph.num_nodes):
+            # Get new name for the activity
+            node_mapping[node] = await self._get_activity_name(
+                ask, self.process_graph.labels[node], *self._describe_neighbours(node, node_mapping)
+            )
+
+        return node_mapping
+
+    async def _name_activities(self, ask):
+        """Replace the Activity_N labels with names generated through `ask`, the
+        blocking or the async prompt, so both APIs share the naming logic."""
+        # Maps node ids to new names
+        if self.naming_mode == 'batch':
+            node_mapping = await self._get_activity_names_batch(ask)
+        else:
+            node_mapping = await self._get_activity_names_sequential(ask)
+        self._apply_node_mapping(node_mapping)
+
+    def _build_structure(self, rng: np.random.Generator) -> ProcessGraph:
+        """Build an unnamed process graph with START, END and Activity_N nodes from `rng`."""
         # Generate random number of nodes
-        num_nodes = random.randint(self.min_nodes, self.max_nodes)
+        num_nodes = int(rng.integers(self.min_nodes, max(self.min_nodes, self.max_nodes) + 1))
 
         # Create nodes (activities) - initially with generic names
-        self.nodes = ['START', 'END']
-        for i in range(num_nodes - 2):  # -2 for START and END
-            self.nodes.append(f'Activity_{i+1}')
-
-        # Initialize graph with empty adjacency lists
-        for node in self.nodes:
-            self.graph[node] = []
+        labels = ['START', 'END'] + [f'Activity_{i+1}' for i in range(num_nodes - 2)]  # -2 for START and END
 
         # Generate random connections ensuring connectivity
-        self._generate_connections()
+        sources, targets = self._generate_connections(num_nodes, rng)
 
         # Validate and fix the graph if necessary
-        self._ensure_valid_process()
+        sources, targets = self._ensure_valid_process(num_nodes, sources, targets, rng)
+
+        # Freeze the topology into the compact integer-indexed form
+        return ProcessGraph.from_edges(labels, sources, targets)
+
+    def _generate_structure(self):
+        """Generate the unnamed process graph of this generator."""
+        self.node_descriptions = {}
+        self.process_graph = self._build_structure(self.rng)
+
+    def _settings(self) -> Dict[str, int]:
+        """Constructor arguments that determine the structure of the generated graphs."""
+        return {'min_nodes': self.min_nodes, 'max_nodes': self.max_nodes,
+                'min_connections': self.min_connections, 'max_connections': self.max_connections}
+
+    def regenerate(self, seed: int, index: int) -> ProcessGraph:
+        """Rebuild model `index` of `generate_many(n, seed=seed)` without generating the others."""
+        return self._build_structure(np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,))))
+
+    def generate_many(self, n: int, seed: Optional[int] = None, processes: Optional[int] = None) -> List[ProcessGraph]:
+        """
+        Generate the structure of `n` process models.
+
+        Model `i` draws from its own random stream, derived from the root seed
+        and `i`, so it does not depend on `n`, on the other models or on how
+        the work is split; `regenerate(seed, i)` returns the same graph. Nodes
+        keep their Activity_N labels, no LLM is involved.
+
+        Args:
+            n: Number of models to generate
+            seed: Root seed. When None a fresh one is drawn and stored in `self.root_seed`
+            processes: Number of worker processes generating shards in parallel (None for in-process)
+
+        Returns:
+            List of ProcessGraph, in index order
+        """
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.root_seed = seed
+
+        if not processes or processes <= 1 or n <= 1:
+            return [self.regenerate(seed, index) for index in range(n)]
+
+        # Contiguous shards, a few per process to even out the load
+        num_shards = min(n, processes * 4)
+        bounds = np.linspace(0, n, num_shards + 1).astype(int)
+        shards = [(self._settings(), seed, int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+        with create_process_pool(processes) as executor:
+            graphs = []
+            for shard in executor.map(_generate_shard, *zip(*shards)):
+                graphs.extend(shard)
+        return graphs
+
+    def _apply_node_mapping(self, node_mapping: Dict[int, str]):
+        """Rename the nodes of the graph with the names generated for them."""
+        labels = [node_mapping.get(i, label) for i, label in enumerate(self.process_graph.labels)]
+        self.process_graph = self.process_graph.relabel(labels)
+
+    def _export_graph(self) -> Dict[str, List[str]]:
+        """Produce the dictionary form of the graph returned by the public API."""
+        self.nodes = list(self.process_graph.labels)
+        self.graph = self.process_graph.to_dict()
+        return self.graph
+
+    def generate_process(self) -> Dict[str, List[str]]:
+        """Generate a random process with start and end activities."""
+        self._generate_structure()
 
         # Now that we have the complete graph structure, generate meaningful names
         if self.lmstudio_connector:
-            new_graph = {}
-            new_nodes = []
-            node_mapping = {}  # Maps old node names to new names
-
-            # First, process START and END
-            new_nodes.extend(['START', 'END'])
-            node_mapping['START'] = 'START'
-            node_mapping['END'] = 'END'
+            run_blocking(self._name_activities(self._ask_blocking))
 
-            # Process middle nodes
-            for node in self.nodes:
-                if node in ['START', 'END']:
-                    continue
+        return self._export_graph()
 
-                incoming_nodes = self._get_incoming_nodes(node)
-                outgoing_nodes = self.graph[node]
+    async def generate_process_async(self) -> Dict[str, List[str]]:
+        """Generate a random process, naming its activities through an AsyncLMStudioConnector."""
+        self._generate_structure()
 
-                # Get new name for the activity
-                new_name = self._get_activity_name(
-                    node,
-                    [node_mapping.get(n, n) for n in incoming_nodes],
-                    [node_mapping.get(n, n) for n in outgoing_nodes]
-                )
+        if self.lmstudio_connector:
+            await self._name_activities(self._ask_async)
 
-                node_mapping[node] = new_name
-                new_nodes.append(new_name)
+        return self._export_graph()
 
-            # Update graph with new names
-            for old_node, targets in self.graph.items():
-                new_node = node_mapping[old_node]
-                new_graph[new_node] = [node_mapping[t] for t in targets]
+    def _image_basename(self) -> str:
+        """Path of the process images without extension, named after the process."""
+        # Using the process name as the filename, replacing spaces with underscores
+        return "images/" + self.process_name.replace(' ', '_').lower().replace('"', '')
 
-            self.graph = new_graph
-            self.nodes = new_nodes
+    def to_dot(self) -> str:
+        """Return the Graphviz DOT source of the process graph, without running Graphviz."""
+        def quote(name: str) -> str:
+            return '"' + name.replace('\\', '\\\\').replace('"', '\\"') + '"'
 
-        return self.graph
+        lines = ['// Process Flow', 'digraph {', '\trankdir=LR']
+        lines.append('\tSTART [label=START fillcolor=lightgreen shape=oval style=filled]')
+        lines.append('\tEND [label=END fillcolor=lightcoral shape=oval style=filled]')
+        for node in self.nodes:
+            if node not in ['START', 'END']:
+                lines.append(f'\t{quote(node)} [label={quote(node)} fillcolor=lightblue shape=box style=filled]')
+        for source, targets in self.graph.items():
+            for target in targets:
+                lines.append(f'\t{quote(source)} -> {quote(target)}')
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+    def save_dot(self) -> str:
+        """Write the DOT source next to the process images and return its path.
+
+        Rendering is left to a GraphRenderer, so generation does not wait for the layout.
+        """
+        path = self._image_basename() + '.gv'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_dot())
+        return path
 
-    def visualize_with_graphviz(self):
+    def visualize_with_graphviz(self, cache_dir: Optional[str] = 'cache/renders'):
         """Alternative visualization using Graphviz for better directed graph layout.
-        Saves the generated graph to a file named after the process name."""
+        Saves the generated graph to a file named after the process name.
+        Images already rendered for the same labelled graph are reused from `cache_dir`,
+        once a process has been generated; an empty graph is rendered without the cache."""
         try:
             import graphviz
 
@@ -262,11 +451,15 @@ class ProcessGenerator:
                 for target in targets:
                     dot.edge(source, target)
 
-            # Save the graph to a file
-            # Using the process name as the filename, replacing spaces with underscores
-            filename = "images/" + self.process_name.replace(' ', '_').lower().replace('"', '')
-            dot.render(filename, format='png', cleanup=True)  # cleanup=True removes the .gv file
-            print(f"Graph saved as {filename}.png")
+            # Save the graph to a file, rendered like the background stage so both share
+            # the image cache; an ungenerated graph has no hash and skips the cache
+            filename = self._image_basename()
+            dot.save(filename + '.gv')
+            key = self.process_graph.structure_hash() if self.process_graph is not None else None
+            with GraphRenderer('png', max_workers=1, cache_dir=cache_dir if key else None) as renderer:
+                if renderer.format:
+                    renderer.render(filename + '.gv', key)  # Removes the .gv file
+                    print(f"Graph saved as {filename}.png")
 
             return dot
         except ImportError:
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import numpy as np
+from typing import Dict, List, Sequence
+
+class ProcessGraph:
+    def __init__(self, labels: Sequence[str], indptr: np.ndarray, indices: np.ndarray):
+        """
+        Compact, integer-indexed process model.
+
+        The topology is kept in CSR arrays: the successors of node `i` are
+        `indices[indptr[i]:indptr[i + 1]]`, and a reverse CSR gives its
+        predecessors. Display names live in a separate label table, so
+        renaming never touches the topology.
+
+        Args:
+            labels: Display name of each node, indexed by node id
+            indptr: Row pointers of the forward adjacency (length num_nodes + 1)
+            indices: Target node ids of every edge, grouped by source
+        """
+        self.labels = list(labels)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self._codes = None
+
+        # Reverse adjacency: edges grouped by target, sources in ascending order
+        sources = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind='stable')
+        self.rev_indices = sources[order]
+        self.rev_indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.num_nodes), out=self.rev_indptr[1:])
+
+    def __reduce__(self):
+        # Ship only the forward CSR and labels between processes, the reverse index is rebuilt
+        return (ProcessGraph, (self.labels, self.indptr, self.indices))
+
+    @classmethod
+    def from_adjacency(cls, labels: Sequence[str], successors: Sequence[Sequence[int]]) -> 'ProcessGraph':
+        """Build a graph from per-node lists of successor ids, keeping their order."""
+        indptr = np.zeros(len(successors) + 1, dtype=np.int64)
+        np.cumsum([len(targets) for targets in successors], out=indptr[1:])
+        indices = np.fromiter((t for targets in successors for t in targets), dtype=np.int64, count=int(indptr[-1]))
+        return cls(labels, indptr, indices)
+
+    @classmethod
+    def from_edges(cls, labels: Sequence[str], sources: np.ndarray, targets: np.ndarray) -> 'ProcessGraph':
+        """Build a graph from parallel arrays of edge sources and targets."""
+        order = np.argsort(sources, kind='stable')
+        indptr = np.zeros(len(labels) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(labels)), out=indptr[1:])
+        return cls(labels, indptr, np.asarray(targets, dtype=np.int64)[order])
+
+    @classmethod
+    def from_dict(cls, graph: Dict[str, List[str]]) -> 'ProcessGraph':
+        """Build a graph from the `Dict[str, List[str]]` form returned by ProcessGenerator."""
+        labels = list(dict.fromkeys(list(graph) + [t for targets in graph.values() for t in targets]))
+        codes = {label: i for i, label in enumerate(labels)}
+        return cls.from_adjacency(labels, [[codes[t] for t in graph.get(label, [])] for label in labels])
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Return the graph as a dictionary of display names to successor names."""
+        return {label: [self.labels[t] for t in self.successors(i)] for i, label in enumerate(self.labels)}
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.labels)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def index(self, label: str) -> int:
+        """Return the node id of a display name."""
+        if self._codes is None:
+            self._codes = {label: i for i, label in enumerate(self.labels)}
+        return self._codes[label]
+
+    def successors(self, node: int) -> np.ndarray:
+        """Node ids the edges of `node` point to."""
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def predecessors(self, node: int) -> np.ndarray:
+        """Node ids with an edge pointing to `node`."""
+        return self.rev_indices[self.rev_indptr[node]:self.rev_indptr[node + 1]]
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.rev_indptr)
+
+    def edges(self):
+        """Return the (sources, targets) arrays of every edge."""
+        return np.repeat(np.arange(self.num_nodes), self.out_degree()), self.indices
+
+    def structure_hash(self) -> str:
+        """Canonical hash of the labelled graph.
+
+        Depends only on the set of labels and of labelled edges, not on node
+        ids or insertion order, so the same process always gets the same hash.
+        """
+        sources, targets = self.edges()
+        payload = json.dumps(
+            {"nodes": sorted(self.labels),
+             "edges": sorted([self.labels[s], self.labels[t]] for s, t in zip(sources.tolist(), targets.tolist()))},
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def relabel(self, labels: Sequence[str]) -> 'ProcessGraph':
+        """Return the same topology with new display names."""
+        if len(labels) != self.num_nodes:
+            raise ValueError(f"Expected {self.num_nodes} labels, got {len(labels)}")
+        return ProcessGraph(labels, self.indptr, self.indices)
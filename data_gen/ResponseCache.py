@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Dict, List, Optional
+
+class ResponseCache:
+    def __init__(self, path: str = 'cache/llm_cache.sqlite', ttl: Optional[float] = None, max_entries: Optional[int] = 100000,
+                 touch_interval: float = 60.0):
+        """
+        Persistent, content-addressed cache of LLM responses stored in SQLite.
+
+        Args:
+            path: Location of the SQLite file. Parent directories are created if needed.
+            ttl: Seconds after which an entry expires. None keeps entries forever.
+            max_entries: Maximum number of entries kept; the least recently used
+                ones are evicted beyond this size. None disables the bound.
+            touch_interval: Seconds before a hit refreshes the access time of an
+                entry again, so most hits are plain reads rather than write
+                transactions. Recency for eviction is accurate to this interval.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # A single connection shared by all threads, serialized through the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' response TEXT NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self._conn.commit()
+        self._size = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    @staticmethod
+    def make_key(messages: List[Dict[str, str]], temperature: float, max_tokens: int, model: Optional[str]) -> str:
+        """Hash the request parameters that determine the response."""
+        payload = json.dumps(
+            {"messages": messages, "temperature": temperature, "max_tokens": max_tokens, "model": model},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for `key`, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created_at, accessed_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at, accessed_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._conn.commit()
+                self._size -= 1
+                self.misses += 1
+                return None
+
+            if now - accessed_at >= self.touch_interval:
+                self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+                self._conn.commit()
+            self.hits += 1
+            return response
+
+    def put(self, key: str, response: str):
+        """Store a response and evict the least recently used entries beyond `max_entries`."""
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute('SELECT 1 FROM responses WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, response, now, now)
+            )
+            if not exists:
+                self._size += 1
+
+            # Evict the least recently used entries beyond the size bound
+            if self.max_entries is not None and self._size > self.max_entries:
+                self._conn.execute(
+                    'DELETE FROM responses WHERE key IN ('
+                    ' SELECT key FROM responses ORDER BY accessed_at LIMIT ?)',
+                    (self._size - self.max_entries,)
+                )
+                self._size = self.max_entries
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the current number of entries."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': self._size
+        }
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,47 @@
+import random
+import threading
+from typing import Dict, Optional
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 30.0, multiplier: float = 2.0):
+        """
+        Retries of transient LLM request failures with exponential backoff and full jitter.
+
+        Attempt `n` that fails waits a random time between 0 and
+        `min(max_delay, base_delay * multiplier ** (n - 1))` before the next one,
+        so callers that failed together do not retry together. Transient
+        failures are connection errors, timeouts, 429 and 5xx responses.
+
+        Args:
+            max_attempts: Total attempts per request, 1 disables retries
+            base_delay: Upper bound of the first wait, in seconds
+            max_delay: Upper bound of any wait, in seconds
+            multiplier: Growth factor of the wait bound per attempt
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.exhausted = 0
+
+    def next_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait after failed attempt number `attempt`, or None when no attempts are left.
+
+        A Retry-After value sent by the server is used as the minimum wait.
+        """
+        with self._lock:
+            if attempt >= self.max_attempts:
+                self.exhausted += 1
+                return None
+            self.retries += 1
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def stats(self) -> Dict:
+        """Return the number of retries made and of requests that ran out of attempts."""
+        with self._lock:
+            return {'retries': self.retries, 'exhausted': self.exhausted}
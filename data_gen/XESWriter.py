@@ -0,0 +1,98 @@
+import gzip
+import numbers
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional
+from xml.sax.saxutils import quoteattr
+
+class XESWriter:
+    def __init__(self, path: str, log_name: Optional[str] = None):
+        """
+        Streaming writer of IEEE XES event logs.
+
+        Traces are written to the file as soon as they are passed to
+        `write_trace`, no document is built in memory, so logs of any size are
+        written with constant memory. Paths ending in `.gz` are gzip-compressed.
+
+        Args:
+            path: Output file, `.xes` or `.xes.gz`
+            log_name: Value of the log's concept:name attribute
+        """
+        self.path = path
+        if path.endswith('.gz'):
+            self._file = gzip.open(path, 'wt', encoding='utf-8')
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+        self.num_traces = 0
+        self.num_events = 0
+        self._write_header(log_name)
+
+    def _write_header(self, log_name: Optional[str]):
+        """Write the XML prolog, the log element, its extensions and global attributes."""
+        self._file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<log xes.version="1.0" xes.features="nested-attributes" xmlns="http://www.xes-standard.org/">\n'
+            '\t<extension name="Concept" prefix="concept" uri="http://www.xes-standard.org/concept.xesext"/>\n'
+            '\t<extension name="Time" prefix="time" uri="http://www.xes-standard.org/time.xesext"/>\n'
+            '\t<extension name="Organizational" prefix="org" uri="http://www.xes-standard.org/org.xesext"/>\n'
+            '\t<extension name="Lifecycle" prefix="lifecycle" uri="http://www.xes-standard.org/lifecycle.xesext"/>\n'
+            '\t<global scope="trace">\n'
+            '\t\t<string key="concept:name" value="__INVALID__"/>\n'
+            '\t</global>\n'
+            '\t<global scope="event">\n'
+            '\t\t<string key="concept:name" value="__INVALID__"/>\n'
+            '\t\t<date key="time:timestamp" value="1970-01-01T00:00:00.000"/>\n'
+            '\t\t<string key="lifecycle:transition" value="complete"/>\n'
+            '\t</global>\n'
+            '\t<classifier name="Activity" keys="concept:name"/>\n'
+        )
+        if log_name:
+            self._file.write(f'\t<string key="concept:name" value={quoteattr(log_name)}/>\n')
+
+    @staticmethod
+    def _attribute(key: str, value) -> str:
+        """Render one typed XES attribute."""
+        if isinstance(value, (bool, np.bool_)):
+            tag, text = 'boolean', 'true' if value else 'false'
+        elif isinstance(value, datetime):
+            tag, text = 'date', value.isoformat(timespec='milliseconds')
+        elif isinstance(value, numbers.Integral):
+            tag, text = 'int', str(int(value))
+        elif isinstance(value, numbers.Real):
+            tag, text = 'float', repr(float(value))
+        else:
+            tag, text = 'string', str(value)
+        return f'<{tag} key={quoteattr(key)} value={quoteattr(text)}/>'
+
+    def write_trace(self, case_id: str, case_attributes: Dict, events: List[Dict]):
+        """Write one trace.
+
+        Args:
+            case_id: Value of the trace's concept:name
+            case_attributes: Trace-level attributes
+            events: Events of the trace in order; each maps XES keys (such as
+                concept:name, time:timestamp, lifecycle:transition) to values
+        """
+        lines = ['\t<trace>', '\t\t' + self._attribute('concept:name', case_id)]
+        lines.extend('\t\t' + self._attribute(key, value) for key, value in case_attributes.items())
+        for event in events:
+            lines.append('\t\t<event>')
+            lines.extend('\t\t\t' + self._attribute(key, value) for key, value in event.items())
+            lines.append('\t\t</event>')
+        lines.append('\t</trace>\n')
+
+        self._file.write('\n'.join(lines))
+        self.num_traces += 1
+        self.num_events += len(events)
+
+    def close(self):
+        """Close the log element and the file."""
+        if not self._file.closed:
+            self._file.write('</log>\n')
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
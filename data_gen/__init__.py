@@ -1,6 +1,49 @@
-from .ProcessGenerator import ProcessGenerator
-from .NameGenerator import NameGenerator
-from .LMStudioConnector import LMStudioConnector
-from .ProcessDataGenerator import ProcessDataGenerator
+import importlib
+import sys
+import types
 
-__all__ = ['ProcessGenerator', 'NameGenerator', 'LMStudioConnector', 'ProcessDataGenerator']
\ No newline at end of file
+# Public classes and the submodule defining each one. They are imported on first
+# access (PEP 562), so a worker that only builds graphs never loads pandas,
+# requests or httpx.
+_LAZY_CLASSES = {
+    'ProcessGenerator': 'ProcessGenerator',
+    'NameGenerator': 'NameGenerator',
+    'LMStudioConnector': 'LMStudioConnector',
+    'AsyncLMStudioConnector': 'AsyncLMStudioConnector',
+    'LMStudioPool': 'LMStudioPool',
+    'ProcessDataGenerator': 'ProcessDataGenerator',
+    'ResponseCache': 'ResponseCache',
+    'BusinessCalendar': 'BusinessCalendar',
+    'XESWriter': 'XESWriter',
+    'ProcessGraph': 'ProcessGraph',
+    'GraphRenderer': 'GraphRenderer',
+    'AdaptiveLimiter': 'AdaptiveLimiter',
+    'RetryPolicy': 'RetryPolicy',
+    'CircuitBreaker': 'CircuitBreaker',
+    'CircuitOpenError': 'CircuitBreaker',
+}
+
+__all__ = ['ProcessGenerator', 'NameGenerator', 'LMStudioConnector', 'AsyncLMStudioConnector', 'LMStudioPool', 'ProcessDataGenerator', 'ResponseCache', 'BusinessCalendar', 'XESWriter', 'ProcessGraph', 'GraphRenderer', 'AdaptiveLimiter', 'RetryPolicy', 'CircuitBreaker', 'CircuitOpenError']
+
+class _LazyPackage(types.ModuleType):
+    def __setattr__(self, name, value):
+        # The import system binds every loaded submodule as a package attribute, and
+        # each submodule is named after its class: keep the class bound, as an eager
+        # `from .X import X` would, also after `import data_gen.X` or unpickling
+        if (isinstance(value, types.ModuleType) and _LAZY_CLASSES.get(name) == name
+                and value.__name__ == f'{__name__}.{name}'):
+            value = getattr(value, name, value)
+        super().__setattr__(name, value)
+
+sys.modules[__name__].__class__ = _LazyPackage
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        module = importlib.import_module(f'.{_LAZY_CLASSES[name]}', __name__)
+        # Cache the class, so later lookups skip __getattr__
+        globals()[name] = getattr(module, name)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
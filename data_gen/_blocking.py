@@ -0,0 +1,17 @@
+from typing import Any, Coroutine
+
+def run_blocking(coroutine: Coroutine) -> Any:
+    """Run a coroutine whose awaits all complete synchronously, without an event loop.
+
+    The synchronous APIs drive the same async code as their async counterparts
+    this way, passing it awaitables that block instead of suspending.
+
+    Raises:
+        RuntimeError: If the coroutine suspends, i.e. awaits real asynchronous I/O
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as e:
+        return e.value
+    coroutine.close()
+    raise RuntimeError("Coroutine suspended outside of an event loop")
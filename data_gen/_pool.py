@@ -0,0 +1,11 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+def create_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool whose workers are started by a fork server (or spawned where
+    there is none) rather than forked from the calling process, whose threads,
+    renderer pool and connector locks may be live and could leave a forked child
+    blocked on a lock held by another thread."""
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method))
@@ -1,26 +1,82 @@
 from threading import Thread
-from queue import Queue
-from data_gen import ProcessGenerator, NameGenerator, LMStudioConnector, ProcessDataGenerator
+from queue import Queue, Empty
+from functools import partial
+from data_gen import ProcessGenerator, NameGenerator, LMStudioConnector, AsyncLMStudioConnector, LMStudioPool, ProcessDataGenerator, ResponseCache, GraphRenderer, AdaptiveLimiter, CircuitBreaker, CircuitOpenError
+from data_gen._pool import create_process_pool
+import asyncio
+import random
+import sys
 import time
 
+def synthesize_event_log(process_graph, process_name, departments, product_categories, num_cases, seed):
+    """Generate and save the event log of a named process.
+
+    Runs in a worker process of the ProcessPoolExecutor, so it only receives the
+    compact graph and plain parameters; everything that needed the LLM has
+    already been resolved by the naming stage.
+    """
+    # Seed per task, so workers started from the same state do not repeat each other
+    # and the log of a task is reproducible
+    data_generator = ProcessDataGenerator(
+        process_graph=process_graph,
+        num_cases=num_cases,
+        process_name=process_name,
+        departments=departments,
+        product_categories=product_categories,
+        seed=seed
+    )
+    data_generator.save_to_csv(f"{process_name}.csv")
+    return process_name
+
+def report_event_log(worker_label, process_name, future):
+    """Print the outcome of a synthesize_event_log task."""
+    if future.exception():
+        print(f"{worker_label} encountered an error: {str(future.exception())}")
+    else:
+        print(f"{worker_label}: Data for process {process_name} created")
+
+def requeue(requeues, name, circuit_breaker, max_requeues):
+    """Count a requeue of `name` and return whether it may go back to the queue.
+
+    Only the times the circuit opened since the last requeue of the name count:
+    rejections while the circuit is still open, or while its probe is in flight,
+    did not reach the server. A name is only held by one worker at a time, so no
+    lock is needed."""
+    count, times_opened = requeues.get(name, (0, 0))
+    if circuit_breaker.times_opened > times_opened:
+        count += 1
+    requeues[name] = (count, circuit_breaker.times_opened)
+    return count <= max_requeues
+
+def report_dropped(requeues, max_requeues):
+    """Print the names given up while the LLM server was unavailable."""
+    dropped = [name for name, (count, _) in requeues.items() if count > max_requeues]
+    if dropped:
+        print(f"LLM server unavailable, {len(dropped)} processes not generated: {', '.join(dropped)}")
+
 class ProcessGeneratorWorker(Thread):
-    def __init__(self, name_queue, connector, thread_id):
+    def __init__(self, name_queue, connector, thread_id, executor, futures, renderer, requeues, max_requeues):
         super().__init__()
         self.name_queue = name_queue
+        self.requeues = requeues  # Times each name went back to the queue, shared by the workers
+        self.max_requeues = max_requeues
         self.connector = connector
         self.thread_id = thread_id
+        self.executor = executor  # Process pool for the CPU-bound log synthesis
+        self.renderer = renderer  # Background Graphviz rendering
+        self.futures = futures
 
     def run(self):
         while True:
             try:
-                process_name = self.name_queue.get_nowait()
-            except Queue.Empty:
+                original_name = self.name_queue.get_nowait()
+            except Empty:
                 break
 
             try:
                 # Get improved name from LMStudio
                 process_name = str(self.connector.get_answer(
-                    f"Give me an improved name for the process: {process_name}, return only the name with a maximum of 3 words"
+                    f"Give me an improved name for the process: {original_name}, return only the name with a maximum of 3 words"
                 )).replace('"', '')
 
                 # Generate process
@@ -36,10 +92,10 @@ class ProcessGeneratorWorker(Thread):
                 proceso = generator.generate_process()
                 print(f"Thread {self.thread_id}: Process {generator.process_name} created")
 
-                # Save the process graph
-                generator.visualize_with_graphviz()
+                # Save the process graph, rendering happens in the background
+                self.renderer.submit(generator.save_dot(), generator.process_graph.structure_hash())
 
-                # Generate data
+                # Resolve departments and product categories through LMStudio
                 data_generator = ProcessDataGenerator(
                     process_graph=proceso,
                     num_cases=500,
@@ -47,9 +103,29 @@ class ProcessGeneratorWorker(Thread):
                     process_name=generator.process_name
                 )
 
-                # Save to CSV
-                data_generator.save_to_csv(f"{generator.process_name}.csv")
-                print(f"Thread {self.thread_id}: Data for process {data_generator.process_name} created")
+                # Generate data and save to CSV in the process pool
+                future = self.executor.submit(
+                    synthesize_event_log,
+                    proceso,
+                    data_generator.process_name,
+                    data_generator.departments,
+                    data_generator.product_categories,
+                    data_generator.num_cases,
+                    random.getrandbits(64)
+                )
+                future.add_done_callback(partial(report_event_log, f"Thread {self.thread_id}", data_generator.process_name))
+                self.futures.append(future)
+
+            except CircuitOpenError as e:
+                # The LLM server is down: retry the process later instead of naming it with
+                # fallbacks, but give it up after max_requeues so the run ends if it stays down
+                if requeue(self.requeues, original_name, self.connector.circuit_breaker, self.max_requeues):
+                    print(f"Thread {self.thread_id}: {e}, requeueing {original_name}")
+                    self.name_queue.put(original_name)
+                else:
+                    print(f"Thread {self.thread_id}: {e}, giving up {original_name}")
+                # Wait for the breaker before taking the next name
+                time.sleep(max(1.0, self.connector.circuit_breaker.retry_in()))
 
             except Exception as e:
                 print(f"Thread {self.thread_id} encountered an error: {str(e)}")
@@ -57,7 +133,16 @@ class ProcessGeneratorWorker(Thread):
             finally:
                 self.name_queue.task_done()
 
-def main(num_threads=4):
+def main(num_threads=4, num_processes=None, cache_path='cache/llm_cache.sqlite', render_format='png', endpoints=None,
+         adaptive_limit=False, max_requeues=3):
+    """Run the pipeline with `num_threads` naming threads feeding a pool of
+    `num_processes` event log workers (defaults to the number of cores).
+    Process graphs are rendered to `render_format` in the background (None
+    keeps only the DOT files). Prompts are spread over the LLM servers in
+    `endpoints` ("host:port" strings), or sent to the local one when None.
+    With `adaptive_limit` an AdaptiveLimiter keeps the prompts in flight at what
+    the server sustains, so `num_threads` can be generous rather than tuned. While the LLM server is unavailable a process goes back to
+    the queue at most `max_requeues` times before it is given up."""
     # Initialize name queue
     name_queue = Queue()
 
@@ -68,27 +153,170 @@ def main(num_threads=4):
         if names:
             name_queue.put(names.pop())
 
-    # Create connector instances for each thread
-    connectors = [LMStudioConnector() for _ in range(num_threads)]
+    # Cache LLM answers on disk so re-runs skip prompts already answered
+    cache = ResponseCache(cache_path) if cache_path else None
+
+    # Share one pooled connector, with one keep-alive connection per thread. The
+    # adaptive limiter keeps the requests in flight at what the server sustains.
+    # Transient errors are retried with backoff, and while the server is down the
+    # circuit breaker fails fast
+    limiter = AdaptiveLimiter() if adaptive_limit else None
+    if endpoints:
+        # Several servers: balance the prompts and eject the failing or slow ones
+        connector = LMStudioPool(endpoints, pool_size=num_threads, cache=cache, limiter=limiter,
+                                 circuit_breaker=CircuitBreaker())
+    else:
+        connector = LMStudioConnector(pool_size=num_threads, cache=cache, limiter=limiter, circuit_breaker=CircuitBreaker())
+
+    requeues = {}
+    with create_process_pool(num_processes) as executor, GraphRenderer(render_format) as renderer:
+        futures = []
+
+        # Create and start workers
+        workers = []
+        for i in range(num_threads):
+            worker = ProcessGeneratorWorker(name_queue, connector, i, executor, futures, renderer, requeues, max_requeues)
+            workers.append(worker)
+            worker.start()
+
+        # Wait for all tasks to complete
+        name_queue.join()
+
+        # Wait for all threads to finish
+        for worker in workers:
+            worker.join()
+
+        # Leaving the block waits for the pending event logs and renders
 
-    # Create and start workers
-    workers = []
-    for i in range(num_threads):
-        worker = ProcessGeneratorWorker(name_queue, connectors[i], i)
-        workers.append(worker)
-        worker.start()
+    connector.close()
+    print(f"LLM connector: {connector.stats()}")
+    report_dropped(requeues, max_requeues)
+    if cache:
+        cache.close()
+    print("All processes completed!")
+
+async def process_generator_worker_async(name_queue, connector, worker_id, executor, renderer, requeues, max_requeues):
+    """Async equivalent of ProcessGeneratorWorker.run.
+
+    LLM prompts are awaited on the event loop, Graphviz rendering runs in the
+    renderer's background pool and event log synthesis in the process pool.
+    """
+    while True:
+        try:
+            original_name = name_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+
+        try:
+            # Get improved name from LMStudio
+            process_name = str(await connector.get_answer_async(
+                f"Give me an improved name for the process: {original_name}, return only the name with a maximum of 3 words"
+            )).replace('"', '')
+
+            # Generate process
+            generator = ProcessGenerator(
+                min_nodes=5,
+                max_nodes=10,
+                min_connections=1,
+                max_connections=3,
+                process_name=process_name,
+                lmstudio_connector=connector
+            )
+
+            proceso = await generator.generate_process_async()
+            print(f"Worker {worker_id}: Process {generator.process_name} created")
+
+            # Save the process graph, rendering happens in the background
+            renderer.submit(generator.save_dot(), generator.process_graph.structure_hash())
+
+            # Resolve departments and product categories through LMStudio
+            data_generator = await ProcessDataGenerator.create_async(
+                process_graph=proceso,
+                num_cases=500,
+                lmstudio_connector=connector,
+                process_name=generator.process_name
+            )
+
+            # Generate data and save to CSV in the process pool
+            await asyncio.get_running_loop().run_in_executor(
+                executor,
+                synthesize_event_log,
+                proceso,
+                data_generator.process_name,
+                data_generator.departments,
+                data_generator.product_categories,
+                data_generator.num_cases,
+                random.getrandbits(64)
+            )
+            print(f"Worker {worker_id}: Data for process {data_generator.process_name} created")
+
+        except CircuitOpenError as e:
+            # The LLM server is down: retry the process later instead of naming it with
+            # fallbacks, but give it up after max_requeues so the run ends if it stays down
+            if requeue(requeues, original_name, connector.circuit_breaker, max_requeues):
+                print(f"Worker {worker_id}: {e}, requeueing {original_name}")
+                name_queue.put_nowait(original_name)
+            else:
+                print(f"Worker {worker_id}: {e}, giving up {original_name}")
+            # Wait for the breaker before taking the next name
+            await asyncio.sleep(max(1.0, connector.circuit_breaker.retry_in()))
+
+        except Exception as e:
+            print(f"Worker {worker_id} encountered an error: {str(e)}")
+
+        finally:
+            name_queue.task_done()
+
+async def async_main(num_workers=256, max_concurrency=None, num_processes=None, cache_path='cache/llm_cache.sqlite', render_format='png',
+                     adaptive_limit=False, max_requeues=3):
+    """Run the pipeline on asyncio: `num_workers` coroutines share one connector
+    that keeps at most `max_concurrency` prompts in flight, and event logs are
+    synthesized by a pool of `num_processes` workers. Process graphs are
+    rendered to `render_format` in the background (None keeps only the DOT files).
+    With `adaptive_limit` an AdaptiveLimiter finds the prompts in flight the
+    server sustains and `max_concurrency` defaults to `num_workers`; without it,
+    to 64. `max_requeues` bounds the retries of a process while the LLM server
+    is unavailable."""
+    # Initialize name queue
+    name_queue = asyncio.Queue()
+    for name in NameGenerator().get_all_names():
+        name_queue.put_nowait(name)
 
-    # Wait for all tasks to complete
-    name_queue.join()
+    # Cache LLM answers on disk so re-runs skip prompts already answered
+    cache = ResponseCache(cache_path) if cache_path else None
 
-    # Wait for all threads to finish
-    for worker in workers:
-        worker.join()
+    requeues = {}
+    with create_process_pool(num_processes) as executor, GraphRenderer(render_format) as renderer:
+        if max_concurrency is None:
+            max_concurrency = num_workers if adaptive_limit else 64
+        limiter = AdaptiveLimiter(max_limit=max_concurrency) if adaptive_limit else None
+        async with AsyncLMStudioConnector(max_concurrency=max_concurrency, cache=cache, limiter=limiter,
+                                          circuit_breaker=CircuitBreaker()) as connector:
+            await asyncio.gather(*(
+                process_generator_worker_async(name_queue, connector, i, executor, renderer, requeues, max_requeues)
+                for i in range(num_workers)
+            ))
+        print(f"LLM connector: {connector.stats()}")
+    report_dropped(requeues, max_requeues)
 
+    if cache:
+        cache.close()
     print("All processes completed!")
 
 if __name__ == "__main__":
     start_time = time.time()
-    main(num_threads=10)
+    render_format = None if '--no-render' in sys.argv else 'svg' if '--svg' in sys.argv else 'png'
+    adaptive_limit = '--adaptive' in sys.argv
+    max_requeues = next((int(arg.split('=', 1)[1]) for arg in sys.argv if arg.startswith('--max-requeues=')), 3)
+    endpoints = next((arg.split('=', 1)[1].split(',') for arg in sys.argv if arg.startswith('--endpoints=')), None)
+    if '--async' in sys.argv:
+        if endpoints:
+            # The async connector talks to a single server, LMStudioPool is synchronous
+            sys.exit("--endpoints is only supported by the threaded pipeline, run it without --async")
+        asyncio.run(async_main(render_format=render_format, adaptive_limit=adaptive_limit, max_requeues=max_requeues))
+    else:
+        # With the adaptive limiter the threads only bound the processes worked on at once
+        main(num_threads=32 if adaptive_limit else 10, render_format=render_format, endpoints=endpoints, adaptive_limit=adaptive_limit,
+             max_requeues=max_requeues)
     end_time = time.time()
     print(f"Total execution time: {end_time - start_time:.2f} seconds")
\ No newline at end of file